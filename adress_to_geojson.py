@@ -1,104 +1,368 @@
 import csv
+import functools
 import json
 import time
 import re
-from typing import Dict, List
+import sqlite3
+import sys
+import multiprocessing
+import threading
+import concurrent.futures
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
-from utils.osmnx_load import get_ox
-ox = get_ox()
-def read_addresses(csv_path: str) -> List[Dict]:
-    """Read addresses from CSV file."""
-    addresses = []
-    with open(csv_path, 'r') as f:
-        reader = csv.reader(f)
-        for row in reader:
-            # Combine address components
-            full_address = f"{row[3]}, {row[4]}, {row[5]} {row[6]}"
-            addresses.append({
-                'name': f"{row[0]} {row[1]}",
-                'email': row[2],
-                'address': full_address
-            })
-    return addresses
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+# Compiled once at import; sanitize_address runs for every CSV row.
+# All removals share one alternation so each address is scanned once:
+#   "Unit XXX", "Apt XXX"/"Apt. XXX", a trailing single-letter unit, periods
+# Engines are tried in order of their worst-case guarantees: google-re2 is a
+# linear-time DFA; the `regex` module gets possessive quantifiers so it never
+# backtracks into a whitespace run; the stdlib re module is the last resort.
+try:
+    import re2
+    _SANITIZE_RE = re2.compile(r'(?i)\bUnit\s+\w+|\bApt\.?\s+\w+|\b[A-Z]$|\.')
+except ImportError:
+    try:
+        import regex
+        _SANITIZE_RE = regex.compile(r'(?i)\bUnit\s++\w++|\bApt\.?\s++\w++|\b[A-Z]$|\.')
+    except ImportError:
+        _SANITIZE_RE = re.compile(r'(?i)\bUnit\s+\w+|\bApt\.?\s+\w+|\b[A-Z]$|\.')
+
+def _has_header(f) -> bool:
+    """Sniff whether a CSV file starts with a header row, leaving `f` rewound."""
+    sample = f.read(4096)
+    f.seek(0)
+    try:
+        return csv.Sniffer().has_header(sample)
+    except csv.Error:
+        return False
+
+# Column order of the input CSV
+CSV_COLUMNS = ['first_name', 'last_name', 'email', 'street', 'city', 'state', 'zip']
+
+def read_addresses(csv_path: str, chunksize: int = 10000) -> Iterator[Dict]:
+    """
+    Lazily read addresses from CSV file.
+    
+    The file is parsed by pandas in chunks, and names and full addresses are
+    assembled with vectorized string operations before rows are yielded.
+    """
+    # Imported here so the script itself starts without loading pandas
+    import pandas as pd
+    
+    with open(csv_path, 'r', newline='') as f:
+        skip_header = _has_header(f)
+    
+    chunks = pd.read_csv(
+        csv_path,
+        header=None,
+        names=CSV_COLUMNS,
+        usecols=range(len(CSV_COLUMNS)),
+        skiprows=1 if skip_header else 0,
+        dtype=str,
+        keep_default_na=False,
+        chunksize=chunksize
+    )
+    for chunk in chunks:
+        # Combine address components
+        names = chunk['first_name'] + " " + chunk['last_name']
+        full_addresses = (chunk['street'] + ", " + chunk['city'] + ", " +
+                          chunk['state'] + " " + chunk['zip'])
+        for name, email, address, street, city, state, zip_code in zip(
+                names, chunk['email'], full_addresses,
+                chunk['street'], chunk['city'], chunk['state'], chunk['zip']):
+            yield {
+                'name': name,
+                'email': email,
+                'address': address,
+                # Kept separate for Nominatim's structured search
+                'street': street,
+                'city': city,
+                'state': state,
+                'zip': zip_code
+            }
+
+@functools.lru_cache(maxsize=65536)
 def sanitize_address(address: str) -> str:
     """Clean up address string for geocoding."""
     # Remove unit/apartment numbers as they often cause geocoding failures
-    replacements = [
-        (r'\bUnit\s+\w+', ''),  # Remove "Unit XXX"
-        (r'\bApt\.?\s+\w+', ''), # Remove "Apt XXX" or "Apt. XXX"
-        (r'\b[A-Z]$', ''),      # Remove single letter unit numbers at end
-        (r'\.', ''),            # Remove periods
-        (r'\s+', ' '),          # Normalize whitespace
-    ]
-    
-    result = address
-    for pattern, replacement in replacements:
-        result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-    
-    return result.strip()
-
-def geocode_addresses(addresses: List[Dict]) -> List[Dict]:
-    """Geocode addresses to get coordinates using OSMnx."""
+    result = _SANITIZE_RE.sub('', address)
+    # split()/join() collapses whitespace runs and strips the ends in one go
+    return ' '.join(result.split())
+
+def _with_clean_address(addr: Dict) -> Dict:
+    """Attach the sanitized address to a CSV row (runs in a worker process)."""
+    addr['clean_address'] = sanitize_address(addr['address'])
+    return addr
+
+def sanitize_rows(addresses: Iterable[Dict], processes: Optional[int] = None,
+                  chunksize: int = 512) -> Iterator[Dict]:
+    """Sanitize rows across CPU cores ahead of the rate-limited geocoding stage."""
+    # With fork, workers inherit the compiled pattern instead of re-importing
+    start_method = 'fork' if sys.platform.startswith('linux') else None
+    with multiprocessing.get_context(start_method).Pool(processes) as pool:
+        # Each row carries its own result, so completion order does not matter
+        yield from pool.imap_unordered(_with_clean_address, addresses, chunksize=chunksize)
+
+class RateLimiter:
+    """Space out calls across threads so at most one starts per interval."""
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_ok = time.monotonic()
+
+    def wait(self):
+        """Block until this caller's slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_ok)
+            self._next_ok = slot + self.interval
+        time.sleep(max(0, slot - now))
+
+    def defer(self, seconds: float):
+        """Hold back every caller for at least `seconds` (e.g. after a 429)."""
+        with self._lock:
+            self._next_ok = max(self._next_ok, time.monotonic() + seconds)
+
+# Nominatim's usage policy allows one request per second per client
+_NOMINATIM_LIMITER = RateLimiter(interval=1.0)
+
+NOMINATIM_SEARCH_URL = "https://nominatim.openstreetmap.org/search"
+
+# One keep-alive session shared by all workers so TLS handshakes are paid once;
+# the pool is sized to geocode_addresses' default worker count
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+_SESSION.headers['User-Agent'] = 'volunteer_analysis/1.0'  # Required by Nominatim
+
+class GeocodeCache:
+    """Persistent SQLite cache of geocoding results keyed by sanitized address."""
+
+    def __init__(self, path: str = "geocode_cache.sqlite", commit_every: int = 50):
+        self.path = path
+        self.commit_every = commit_every
+        self._conn = None
+        self._pending = 0
+
+    def __enter__(self):
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS geo(addr TEXT PRIMARY KEY, lat REAL, lng REAL)"
+        )
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._conn.commit()
+        self._conn.close()
+        self._conn = None
+
+    def get(self, address: str) -> Optional[Tuple[float, float]]:
+        """Return cached (lat, lng) for an address, or None on a miss."""
+        return self._conn.execute(
+            "SELECT lat, lng FROM geo WHERE addr = ?", (address,)
+        ).fetchone()
+
+    def set(self, address: str, lat: float, lng: float):
+        """Store coordinates, committing every `commit_every` writes."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO geo(addr, lat, lng) VALUES (?, ?, ?)",
+            (address, lat, lng)
+        )
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self._conn.commit()
+            self._pending = 0
+
+def _retry_after_seconds(response, default: float = 5.0) -> float:
+    """Read a Retry-After header given in seconds, falling back to `default`."""
+    try:
+        return float(response.headers.get('Retry-After', default))
+    except ValueError:
+        return default
+
+def _nominatim_search(params: Dict, max_retries: int = 3) -> Optional[Tuple[float, float]]:
+    """Run a rate-limited Nominatim search and return the top (lat, lng) hit."""
+    for attempt in range(max_retries + 1):
+        _NOMINATIM_LIMITER.wait()
+        response = _SESSION.get(NOMINATIM_SEARCH_URL, params={
+            **params,
+            'format': 'json',
+            'limit': 1
+        }, timeout=10)
+        
+        # Back off every worker when the server says it is overloaded
+        if response.status_code in (429, 503) and attempt < max_retries:
+            retry_after = _retry_after_seconds(response)
+            print(f"Nominatim returned {response.status_code}; waiting {retry_after:.0f} seconds before retrying...")
+            _NOMINATIM_LIMITER.defer(retry_after)
+            continue
+        
+        response.raise_for_status()
+        results = response.json()
+        if results:
+            return float(results[0]['lat']), float(results[0]['lon'])
+        return None
+
+def geocode_structured(addr: Dict) -> Optional[Tuple[float, float]]:
+    """Geocode an address with Nominatim's structured street/city/state/zip search."""
+    return _nominatim_search({
+        'street': addr['street'],
+        'city': addr['city'],
+        'state': addr['state'],
+        'postalcode': addr['zip']
+    })
+
+def geocode_freeform(query: str) -> Optional[Tuple[float, float]]:
+    """Geocode a free-form address string with Nominatim."""
+    return _nominatim_search({'q': query})
+
+def _geocode_one(addr: Dict, clean_address: str):
+    """Geocode an address, falling back to a free-form query on the sanitized string."""
+    return geocode_structured(addr) or geocode_freeform(clean_address)
+
+def geocode_addresses(addresses: Iterable[Dict], cache: Optional[GeocodeCache] = None,
+                      max_workers: int = 4) -> List[Dict]:
+    """
+    Geocode addresses to get coordinates using Nominatim, consulting `cache` first.
+    
+    Rows that sanitize to the same address (households, shared workplaces)
+    share a single request, and its coordinates are copied to each of them.
+    """
     geocoded = []
     
-    for addr in addresses:
-        try:
-            # Sanitize the address before geocoding
-            clean_address = sanitize_address(addr['address'])
-            # Use OSMnx's geocoder (which uses Nominatim)
-            result = ox.geocode(clean_address)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_address = {}
+        rows_by_address: Dict[str, List[Dict]] = {}
+        for addr in addresses:
+            # Rows from sanitize_rows arrive pre-sanitized; otherwise do it here
+            # so regex work still overlaps the rate-limited requests
+            clean_address = addr.get('clean_address') or sanitize_address(addr['address'])
+            
+            # Already requested: wait for that result instead of asking again
+            if clean_address in rows_by_address:
+                rows_by_address[clean_address].append(addr)
+                continue
+            
+            cached = cache.get(clean_address) if cache else None
+            if cached:
+                lat, lng = cached
+                # Rows are not reused after this, so annotate them in place
+                addr['coordinates'] = [lng, lat]  # GeoJSON uses [longitude, latitude]
+                geocoded.append(addr)
+                continue
+            
+            rows_by_address[clean_address] = [addr]
+            future = executor.submit(_geocode_one, addr, clean_address)
+            future_to_address[future] = clean_address
+        
+        for future in concurrent.futures.as_completed(future_to_address):
+            clean_address = future_to_address[future]
+            rows = rows_by_address[clean_address]
+            try:
+                result = future.result()
+            except Exception as e:
+                for addr in rows:
+                    print(f"Error geocoding address {addr['address']}: {str(e)}")
+                continue
+            
             if result:
                 lat, lng = result
-                geocoded.append({
-                    **addr,
-                    'coordinates': [lng, lat]  # GeoJSON uses [longitude, latitude]
-                })
-                # Be nice to the geocoding service
-                time.sleep(1)
+                # The cache connection is only touched from this thread
+                if cache:
+                    cache.set(clean_address, lat, lng)
+                for addr in rows:
+                    addr['coordinates'] = [lng, lat]
+                    geocoded.append(addr)
             else:
-                print(f"Could not geocode address: {addr['address']}")
-        except Exception as e:
-            print(f"Error geocoding address {addr['address']}: {str(e)}")
-            continue
+                for addr in rows:
+                    print(f"Could not geocode address: {addr['address']}")
     
     return geocoded
 
-def create_geojson(geocoded_addresses: List[Dict], output_path: str):
-    """Create GeoJSON file from geocoded addresses."""
-    features = []
-    for addr in geocoded_addresses:
-        feature = {
-            "type": "Feature",
-            "geometry": {
-                "type": "Point",
-                "coordinates": addr['coordinates']
-            },
-            "properties": {
-                "name": addr['name'],
-                "email": addr['email'],
-                "address": addr['address']
-            }
+def _feature(addr: Dict) -> Dict:
+    """Build a GeoJSON Point feature for a geocoded address."""
+    return {
+        "type": "Feature",
+        "geometry": {
+            "type": "Point",
+            "coordinates": addr['coordinates']
+        },
+        "properties": {
+            "name": addr['name'],
+            "email": addr['email'],
+            "address": addr['address']
         }
-        features.append(feature)
-    
-    geojson = {
-        "type": "FeatureCollection",
-        "features": features
     }
+
+def _dumps(obj) -> bytes:
+    """Serialize compactly to UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def _valid_coordinates(geocoded_addresses: List[Dict]) -> List[Dict]:
+    """Drop addresses whose [lng, lat] pair is non-finite or out of range."""
+    # Imported here so the script itself starts without loading numpy
+    import numpy as np
+    
+    # Validate all points in one vectorized pass over a float64 (N, 2) array
+    coords = np.array([addr['coordinates'] for addr in geocoded_addresses],
+                      dtype=np.float64).reshape(-1, 2)
+    valid = (np.isfinite(coords).all(axis=1) &
+             (np.abs(coords[:, 0]) <= 180) &
+             (np.abs(coords[:, 1]) <= 90))
+    
+    if valid.all():
+        return geocoded_addresses
+    print(f"Skipping {int((~valid).sum())} addresses with invalid coordinates")
+    return [addr for addr, ok in zip(geocoded_addresses, valid) if ok]
+
+def create_geojson(geocoded_addresses: List[Dict], output_path: str, pretty: bool = False):
+    """
+    Create GeoJSON file from geocoded addresses.
+    
+    Features are streamed to disk one at a time. Pass pretty=True for an
+    indented file, which is built in memory with the stdlib json module.
+    """
+    geocoded_addresses = _valid_coordinates(geocoded_addresses)
+    
+    # map() drives the feature construction loop in C and stays lazy
+    features = map(_feature, geocoded_addresses)
+    
+    if pretty:
+        geojson = {
+            "type": "FeatureCollection",
+            "features": list(features)
+        }
+        with open(output_path, 'w') as f:
+            json.dump(geojson, f, indent=2)
+        return
     
-    with open(output_path, 'w') as f:
-        json.dump(geojson, f, indent=2)
+    with open(output_path, 'wb') as f:
+        write = f.write
+        write(b'{"type":"FeatureCollection","features":[')
+        for i, feature in enumerate(features):
+            if i:
+                write(b',')
+            write(_dumps(feature))
+        write(b']}')
 
 def main():
     input_csv = "addresses.csv"
     output_geojson = "addresses.geojson"
     
     print("Reading addresses...")
-    addresses = read_addresses(input_csv)
+    addresses = sanitize_rows(read_addresses(input_csv))
     
     print("Geocoding addresses...")
-    geocoded = geocode_addresses(addresses)
+    with GeocodeCache() as cache:
+        geocoded = geocode_addresses(addresses, cache)
     
     print("Creating GeoJSON file...")
     create_geojson(geocoded, output_geojson)
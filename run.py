@@ -16,6 +16,27 @@ logging.basicConfig(
 # Load environment variables
 load_dotenv()
 
+def run_streamlit(app_path: str):
+    """
+    Run a Streamlit app inside this interpreter.
+    
+    Going through Streamlit's own CLI entry point avoids starting a second
+    Python process and re-importing everything. Falls back to the
+    `streamlit` executable if Streamlit cannot be imported here.
+    
+    Args:
+        app_path: Path to the Streamlit script
+    """
+    try:
+        from streamlit.web import cli as stcli
+    except ImportError:
+        logging.warning("Could not import Streamlit in-process; launching it as a subprocess instead.")
+        subprocess.run(["streamlit", "run", app_path])
+        return
+    
+    sys.argv = ["streamlit", "run", app_path]
+    stcli.main()
+
 def main():
     """
     Launch the Volunteer Analysis Dashboard application.
@@ -30,7 +51,7 @@ def main():
         
         # Launch the Streamlit app
         logging.info("Starting Volunteer Analysis Dashboard...")
-        subprocess.run(["streamlit", "run", "src/app.py"])
+        run_streamlit("src/app.py")
         
     except Exception as e:
         logging.error(f"Error launching application: {str(e)}")
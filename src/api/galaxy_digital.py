@@ -1,12 +1,32 @@
 import os
+import concurrent.futures
+import fnmatch
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from datetime import datetime, timedelta
 import logging
 import json
+import random
+import threading
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib decoder
+    orjson = None
 
 from utils.cache_manager import CacheManager
+from utils.rate_limiter import TokenBucket
+
+def _decode_json(response: requests.Response) -> Any:
+    """Decode a response body, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 class GalaxyDigitalAPI:
     """
@@ -16,11 +36,41 @@ class GalaxyDigitalAPI:
     and hours logged from the Galaxy Digital platform.
     """
     
+    # Endpoints documented as accepting a `page` query parameter; these can be
+    # fetched several pages at a time instead of walking since_id serially
+    PAGED_ENDPOINTS = {"users"}
+    
+    # Cache lifetime in seconds per endpoint pattern, matched in order with
+    # fnmatch; rosters churn slowly while hours are logged continuously.
+    # Endpoints not listed fall back to the cache manager's max_age_days.
+    TTL_POLICY = {
+        'users': 7 * 86400,
+        'users/*/hours': 1800,
+        'users/*': 7 * 86400,
+        'needs': 3 * 86400,
+        'needs/*': 3 * 86400,
+        'hours/summary': 900,
+        'hours': 3600,
+    }
+    
+    # Cached endpoints made stale by a successful POST/PUT/DELETE to each
+    # endpoint template; {id} is filled from the mutated endpoint
+    INVALIDATION_MAP = {
+        'users': ['users'],
+        'users/{id}': ['users', 'users/{id}', 'detailed_volunteers'],
+        'users/{id}/hours': ['users/{id}/hours', 'hours', 'hours/summary'],
+        'needs': ['needs'],
+        'needs/{id}': ['needs', 'needs/{id}'],
+        'needs/{id}/responses': ['needs/{id}/responses'],
+        'hours': ['hours', 'hours/summary'],
+        'hours/{id}': ['hours', 'hours/summary'],
+    }
+    
     def __init__(self, api_key: Optional[str] = None, email: Optional[str] = None, 
                  password: Optional[str] = None, base_url: Optional[str] = None,
                  debug: bool = False, skip_login: bool = False, use_cache: bool = True,
                  cache_dir: str = "cache", cache_max_age_days: int = 7, test_mode: bool = False,
-                 test_limit: int = 10):
+                 test_limit: int = 10, token_cache_path: Optional[str] = None, token_ttl: int = 3600):
         """
         Initialize the Galaxy Digital API client.
         
@@ -36,15 +86,23 @@ class GalaxyDigitalAPI:
             cache_max_age_days: Maximum age of cache files in days before they're considered stale
             test_mode: Whether to run in test mode (limits the number of users queried)
             test_limit: Maximum number of users to query in test mode
+            token_cache_path: File used to reuse the login token across runs. Defaults to
+                ~/.cache/galaxy_digital/token.json; pass an empty string to disable.
+            token_ttl: Seconds a cached login token is trusted before logging in again
         """
         self.api_key = api_key or os.getenv("GALAXY_API_KEY")
         self.email = email or os.getenv("GALAXY_EMAIL")
         self.password = password or os.getenv("GALAXY_PASSWORD")
         self.base_url = base_url or os.getenv("GALAXY_BASE_URL", "https://api.galaxydigital.com/api")
+        # Endpoint URLs are built by plain concatenation onto this
+        self._base_url = self.base_url.rstrip('/') + '/'
         self.debug = debug or os.getenv("DEBUG", "False").lower() == "true"
         self.use_cache = use_cache
         self.test_mode = test_mode
         self.test_limit = test_limit
+        self.token_cache_path = (os.path.expanduser("~/.cache/galaxy_digital/token.json")
+                                 if token_cache_path is None else token_cache_path)
+        self.token_ttl = token_ttl
         
         if self.test_mode:
             logging.info(f"Running in TEST MODE - limiting to {self.test_limit} users")
@@ -65,12 +123,44 @@ class GalaxyDigitalAPI:
             logging.warning("Galaxy Digital API key, email, or password not provided. API calls will fail.")
             logging.debug(f"API Key present: {bool(self.api_key)}, Email present: {bool(self.email)}, Password present: {bool(self.password)}")
         
+        # One pooled session serves login and data calls so keep-alive
+        # connections are reused instead of re-handshaking TLS per request
         self.session = requests.Session()
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Content-Type': 'application/json',
+        })
+        # Pool is sized for the threaded fanout paths; transient 5xx on GETs are
+        # retried with backoff inside urllib3 (429s are handled in _make_request)
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[500, 502, 503, 504],
+                allowed_methods=frozenset(['GET']),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.token = None
         self.login_response = None
         
-        # Authenticate on initialization unless skipped
-        if not skip_login:
+        # Whether the users endpoint honours an id_in filter; None until probed
+        self._supports_id_in = None
+        
+        # Paces outgoing requests; backs off on 429s and recovers on success
+        self._limiter = TokenBucket(rate=10, capacity=20)
+        
+        # In-flight GETs keyed by request, so concurrent duplicates share one call
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Authenticate on initialization unless skipped or a recent token is on disk
+        if not skip_login and not self._load_cached_token():
             try:
                 self.login()
             except Exception as e:
@@ -88,11 +178,7 @@ class GalaxyDigitalAPI:
         Returns:
             Authentication token or None if authentication failed
         """
-        login_url = f"{self.base_url}/users/login"
-        headers = {
-            'Accept': 'application/json',
-            'Content-Type': 'application/json',
-        }
+        login_url = self._base_url + "users/login"
         data = {
             'key': self.api_key,
             'user_email': self.email,
@@ -108,7 +194,7 @@ class GalaxyDigitalAPI:
         
         for attempt in range(max_retries):
             try:
-                response = requests.post(login_url, headers=headers, json=data)
+                response = self.session.post(login_url, json=data, timeout=30)
                 
                 if self.debug:
                     logging.debug(f"Login response status: {response.status_code}")
@@ -117,7 +203,7 @@ class GalaxyDigitalAPI:
                 
                 # Handle different response status codes
                 if response.status_code == 200:
-                    resp_data = response.json()
+                    resp_data = _decode_json(response)
                     self.login_response = resp_data.get('data', {})
                     self.token = self.login_response.get('token')
                     
@@ -127,9 +213,9 @@ class GalaxyDigitalAPI:
                     
                     # Update session headers with token
                     self.session.headers.update({
-                        'Accept': 'application/json',
                         'Authorization': f"Bearer {self.token}"
                     })
+                    self._save_cached_token()
                     
                     logging.info("Successfully authenticated with Galaxy Digital API")
                     return self.token
@@ -139,7 +225,7 @@ class GalaxyDigitalAPI:
                 elif response.status_code == 500:
                     if attempt < max_retries - 1:
                         logging.warning(f"Server error during login (attempt {attempt+1}/{max_retries}). Retrying in {retry_delay} seconds...")
-                        time.sleep(retry_delay)
+                        time.sleep(retry_delay * (1 + random.random() * 0.3))
                     else:
                         logging.error("Server error during login. Max retries exceeded.")
                         response.raise_for_status()
@@ -153,18 +239,134 @@ class GalaxyDigitalAPI:
                 
                 if attempt < max_retries - 1:
                     logging.warning(f"Retrying login in {retry_delay} seconds... (attempt {attempt+1}/{max_retries})")
-                    time.sleep(retry_delay)
+                    time.sleep(retry_delay * (1 + random.random() * 0.3))
                 else:
                     logging.error("Max retries exceeded for login")
                     raise
         
         return None
     
+    def _cache_ttl(self, endpoint: str) -> Optional[int]:
+        """
+        Resolve the cache lifetime for an endpoint from TTL_POLICY.
+        
+        Args:
+            endpoint: API endpoint
+            
+        Returns:
+            Lifetime in seconds, or None to use the cache manager default
+        """
+        for pattern, ttl in self.TTL_POLICY.items():
+            if fnmatch.fnmatchcase(endpoint, pattern):
+                return ttl
+        return None
+    
+    def _invalidate_for(self, endpoint: str) -> None:
+        """
+        Drop cached GET responses that a mutation of `endpoint` makes stale.
+        
+        Args:
+            endpoint: Endpoint that was successfully modified
+        """
+        for template, dependents in self.INVALIDATION_MAP.items():
+            pattern = re.escape(template).replace(re.escape('{id}'), '(?P<id>[^/]+)')
+            match = re.fullmatch(pattern, endpoint)
+            if match:
+                resource_id = match.groupdict().get('id')
+                for dependent in dependents:
+                    self.cache_manager.invalidate(dependent.format(id=resource_id))
+                return
+    
+    def _cache_not_found(self, endpoint: str, params: Dict, method: str, should_use_cache: bool,
+                         cache_key: Optional[str] = None) -> None:
+        """
+        Cache an empty result for a GET that returned 404.
+        
+        Volunteers with no logged hours 404 on every lookup; caching the
+        negative result keeps repeated scans from re-requesting them.
+        
+        Args:
+            endpoint: API endpoint that returned 404
+            params: Request parameters
+            method: HTTP method of the request
+            should_use_cache: Whether caching is enabled for this request
+            cache_key: Precomputed cache key for this request, if any
+        """
+        if should_use_cache and method == "GET" and self.cache_manager:
+            self.cache_manager.save_to_cache(endpoint, params, [], ttl=self._cache_ttl(endpoint) or 3600,
+                                             tombstone=True, cache_key=cache_key)
+    
+    def _load_cached_token(self) -> bool:
+        """
+        Reuse a login token saved by a previous run, if it is still fresh.
+        
+        Returns:
+            True if a cached token was applied to the session
+        """
+        if not self.token_cache_path or not os.path.exists(self.token_cache_path):
+            return False
+        
+        try:
+            with open(self.token_cache_path, 'r') as f:
+                cached = json.load(f)
+        except Exception as e:
+            logging.debug(f"Ignoring unreadable token cache: {str(e)}")
+            return False
+        
+        # Tokens belong to one account on one server, and must outlive this startup
+        if (cached.get('email') != self.email or cached.get('base_url') != self.base_url
+                or cached.get('expires_at', 0) <= time.time() + 60):
+            return False
+        
+        self.token = cached['token']
+        self.session.headers.update({'Authorization': f"Bearer {self.token}"})
+        logging.info("Using cached Galaxy Digital API token")
+        return True
+    
+    def _save_cached_token(self) -> None:
+        """
+        Persist the current login token so later runs can skip logging in.
+        """
+        if not self.token_cache_path:
+            return
+        
+        try:
+            os.makedirs(os.path.dirname(self.token_cache_path) or '.', exist_ok=True)
+            # Create the file owner-only before the token is written to it
+            fd = os.open(self.token_cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({
+                    'token': self.token,
+                    'expires_at': time.time() + self.token_ttl,
+                    'email': self.email,
+                    'base_url': self.base_url,
+                }, f)
+            os.chmod(self.token_cache_path, 0o600)
+        except Exception as e:
+            logging.warning(f"Could not save token cache: {str(e)}")
+    
+    def _clear_cached_token(self) -> None:
+        """
+        Remove the persisted login token after the server rejects it.
+        """
+        if self.token_cache_path:
+            try:
+                os.remove(self.token_cache_path)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.warning(f"Could not remove token cache: {str(e)}")
+    
     def _make_request(self, endpoint: str, method: str = "GET", params: Optional[Dict] = None, 
-                     data: Optional[Dict] = None, handle_404: bool = False, use_cache: Optional[bool] = None) -> Dict:
+                     data: Optional[Dict] = None, handle_404: bool = False, use_cache: Optional[bool] = None,
+                     max_attempts: int = 5) -> Dict:
         """
         Make a request to the Galaxy Digital API.
         
+        Identical GETs issued concurrently (e.g. from the threaded fanout paths)
+        share a single in-flight request; only the first caller hits the cache
+        or network and the others wait for its result.
+        
         Args:
             endpoint: API endpoint to call
             method: HTTP method (GET, POST, etc.)
@@ -172,18 +374,52 @@ class GalaxyDigitalAPI:
             data: Request body for POST/PUT requests
             handle_404: If True, return empty data on 404 instead of raising an exception
             use_cache: Whether to use cache for this request (overrides instance setting)
+            max_attempts: Maximum number of attempts, counting rate-limit and re-authentication retries
             
         Returns:
             Response data as dictionary
         """
-        url = f"{self.base_url}/{endpoint}"
+        if method != "GET":
+            return self._request(endpoint, method, params, data, handle_404, use_cache, max_attempts)
+        
+        flight_key = (endpoint, handle_404, use_cache,
+                      tuple(sorted((key, str(value)) for key, value in (params or {}).items())))
+        with self._inflight_lock:
+            future = self._inflight.get(flight_key)
+            is_leader = future is None
+            if is_leader:
+                future = concurrent.futures.Future()
+                self._inflight[flight_key] = future
+        
+        if not is_leader:
+            logging.debug(f"Joining in-flight request to {endpoint}")
+            return future.result()
+        
+        try:
+            result = self._request(endpoint, method, params, data, handle_404, use_cache, max_attempts)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(flight_key, None)
+    
+    def _request(self, endpoint: str, method: str, params: Optional[Dict], data: Optional[Dict],
+                 handle_404: bool, use_cache: Optional[bool], max_attempts: int) -> Dict:
+        """
+        Perform one (possibly cached) API call with retries; see _make_request.
+        """
+        url = self._base_url + endpoint
         
         if params is None:
             params = {}
             
-        # Add default parameters for pagination
+        # Add default parameters for pagination on a copy; the caller's dict
+        # must not change or repeated calls with it would drift cache keys
         if method == "GET" and 'per_page' not in params:
-            params['per_page'] = 150
+            params = {**params, 'per_page': 150}
         
         # Determine if we should use cache for this request
         should_use_cache = self.use_cache if use_cache is None else use_cache
@@ -192,15 +428,23 @@ class GalaxyDigitalAPI:
         logging.info(f"Making request to {endpoint} (method: {method}, use_cache: {should_use_cache})")
         
         # Only use cache for GET requests
+        cache_entry = None
+        cache_key = None
+        headers = {}
         if should_use_cache and method == "GET" and self.cache_manager:
             logging.info(f"Checking cache for {endpoint}")
+            # Hash the params once; the same key serves the lookup and the save
+            cache_key = self.cache_manager.get_cache_key(endpoint, params)
             # Try to get from cache first
-            cached_data = self.cache_manager.load_from_cache(endpoint, params)
-            if cached_data is not None:
+            cache_entry = self.cache_manager.load_cache_entry(endpoint, params, cache_key=cache_key)
+            if cache_entry is not None and self.cache_manager.is_fresh(cache_entry):
                 logging.info(f"Using cached data for {endpoint}")
-                return {"data": cached_data}
+                return {"data": cache_entry["data"]}
             else:
                 logging.info(f"No valid cache found for {endpoint}, making API request")
+                # Revalidate a stale entry so an unchanged resource costs a 304, not a body
+                if cache_entry is not None and cache_entry.get("etag"):
+                    headers['If-None-Match'] = cache_entry["etag"]
         else:
             if not should_use_cache:
                 logging.info(f"Cache disabled for this request to {endpoint}")
@@ -209,57 +453,88 @@ class GalaxyDigitalAPI:
             elif not self.cache_manager:
                 logging.info(f"Cache manager not available for request to {endpoint}")
         
-        # If not in cache or cache disabled, make the actual request
-        try:
-            # Add a small delay to avoid rate limiting
-            time.sleep(0.1)
-            
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                json=data
-            )
-            
-            # Handle 404 errors specially if requested
-            if handle_404 and response.status_code == 404:
-                if self.debug:
-                    logging.debug(f"404 Not Found for {url} - returning empty data")
-                return {"data": []}
-            
-            # Handle rate limiting (429 Too Many Requests)
-            if response.status_code == 429:
-                retry_after = int(response.headers.get('Retry-After', 5))
-                logging.warning(f"Rate limited by API. Waiting {retry_after} seconds before retrying...")
-                time.sleep(retry_after)
-                return self._make_request(endpoint, method, params, data, handle_404, use_cache)
+        # If not in cache or cache disabled, make the actual request. Retries
+        # loop here rather than recursing so the cache prelude runs only once
+        reauthenticated = False
+        for attempt in range(max_attempts):
+            try:
+                # Wait for a token; only blocks once a burst has drained the bucket
+                self._limiter.acquire()
                 
-            response.raise_for_status()
-            result = response.json()
-            
-            # Save successful GET responses to cache
-            if should_use_cache and method == "GET" and self.cache_manager:
-                self.cache_manager.save_to_cache(endpoint, params, result.get('data', []))
-            
-            return result
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Error making request to Galaxy Digital API: {str(e)}")
-            if hasattr(e, 'response') and e.response:
-                logging.error(f"Response: {e.response.text}")
-            
-            # If unauthorized, try to re-authenticate and retry
-            if hasattr(e, 'response') and e.response and e.response.status_code == 401:
-                logging.info("Token expired, attempting to re-authenticate")
-                self.login()
-                return self._make_request(endpoint, method, params, data, handle_404, use_cache)
-            
-            # If handle_404 is True and we got a 404, return empty data
-            if handle_404 and hasattr(e, 'response') and e.response and e.response.status_code == 404:
-                if self.debug:
-                    logging.debug(f"404 Not Found for {url} - returning empty data")
-                return {"data": []}
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    json=data,
+                    headers=headers
+                )
                 
-            raise
+                # Stale cache entry is still current; refresh its timestamp and reuse it
+                if response.status_code == 304 and cache_entry is not None:
+                    logging.info(f"Cached data for {endpoint} revalidated (304 Not Modified)")
+                    self.cache_manager.save_to_cache(endpoint, params, cache_entry["data"],
+                                                     ttl=self._cache_ttl(endpoint), etag=cache_entry.get("etag"),
+                                                     cache_key=cache_key)
+                    return {"data": cache_entry["data"]}
+                
+                # Handle 404 errors specially if requested
+                if handle_404 and response.status_code == 404:
+                    if self.debug:
+                        logging.debug(f"404 Not Found for {url} - returning empty data")
+                    self._cache_not_found(endpoint, params, method, should_use_cache, cache_key)
+                    return {"data": []}
+                
+                # Handle rate limiting (429 Too Many Requests); on the last
+                # attempt fall through so raise_for_status reports it
+                if response.status_code == 429 and attempt < max_attempts - 1:
+                    self._limiter.throttled()
+                    # Jitter keeps concurrent workers from retrying in lockstep
+                    retry_after = int(response.headers.get('Retry-After', 5)) * (1 + random.random() * 0.3)
+                    logging.warning(f"Rate limited by API. Waiting {retry_after:.1f} seconds before retrying "
+                                    f"(attempt {attempt + 1}/{max_attempts})...")
+                    time.sleep(retry_after)
+                    continue
+                    
+                response.raise_for_status()
+                self._limiter.succeeded()
+                
+                # A successful mutation makes cached reads of the same resources stale
+                if method != "GET" and self.cache_manager:
+                    self._invalidate_for(endpoint)
+                
+                result = _decode_json(response)
+                
+                # Save successful GET responses to cache
+                if should_use_cache and method == "GET" and self.cache_manager:
+                    self.cache_manager.save_to_cache(endpoint, params, result.get('data', []),
+                                                     ttl=self._cache_ttl(endpoint), etag=response.headers.get('ETag'),
+                                                     cache_key=cache_key)
+                
+                return result
+            except requests.exceptions.RequestException as e:
+                error_response = getattr(e, 'response', None)
+                logging.error(f"Error making request to Galaxy Digital API: {str(e)}")
+                if error_response is not None:
+                    logging.error(f"Response: {error_response.text}")
+                
+                # If unauthorized, re-authenticate once and retry
+                if error_response is not None and error_response.status_code == 401 and not reauthenticated:
+                    logging.info("Token expired, attempting to re-authenticate")
+                    self._clear_cached_token()
+                    self.login()
+                    reauthenticated = True
+                    continue
+                
+                # If handle_404 is True and we got a 404, return empty data
+                if handle_404 and error_response is not None and error_response.status_code == 404:
+                    if self.debug:
+                        logging.debug(f"404 Not Found for {url} - returning empty data")
+                    self._cache_not_found(endpoint, params, method, should_use_cache, cache_key)
+                    return {"data": []}
+                    
+                raise
+        
+        raise requests.exceptions.RetryError(f"Giving up on {url} after {max_attempts} attempts")
     
     def get_all_data(self, endpoint: str, params: Optional[Dict] = None, use_cache: Optional[bool] = None) -> List[Dict]:
         """
@@ -286,15 +561,18 @@ class GalaxyDigitalAPI:
         
         # Check if we have a complete cached response first
         should_use_cache = self.use_cache if use_cache is None else use_cache
+        limit_users = self.test_mode and endpoint == "users"
+        
+        # Build the complete-dataset cache key once so loading and saving
+        # are guaranteed to use the same params
+        cache_params = {**working_params, 'complete_dataset': True}
+        if limit_users:
+            cache_params['test_mode'] = True
         
         # Log the cache status for this request
         logging.info(f"get_all_data for {endpoint}: use_cache={should_use_cache}, cache_manager={self.cache_manager is not None}")
         
         if should_use_cache and self.cache_manager:
-            # Create a special cache key for the complete dataset
-            cache_params = working_params.copy()
-            cache_params['complete_dataset'] = True
-            
             # Try to load from cache
             logging.info(f"Attempting to load complete dataset for {endpoint} from cache")
             cached_data = self.cache_manager.load_from_cache(endpoint, cache_params)
@@ -302,7 +580,7 @@ class GalaxyDigitalAPI:
                 logging.info(f"Using complete cached dataset for {endpoint} ({len(cached_data)} records)")
                 
                 # If in test mode, limit the number of records returned
-                if self.test_mode and endpoint == "users":
+                if limit_users:
                     limited_data = cached_data[:self.test_limit]
                     logging.info(f"TEST MODE: Limiting {len(cached_data)} records to {len(limited_data)} records")
                     return limited_data
@@ -310,85 +588,204 @@ class GalaxyDigitalAPI:
                 return cached_data
             else:
                 logging.info(f"No complete cached dataset found for {endpoint}")
-                
-                # Try to find any cache file for this endpoint to diagnose issues
-                cache_dir = self.cache_manager.cache_dir
-                if os.path.exists(cache_dir):
-                    cache_files = [f for f in os.listdir(cache_dir) if f.endswith('.json')]
-                    logging.info(f"Found {len(cache_files)} cache files in {cache_dir}")
-                    
-                    # Check if there are any cache files for this endpoint
-                    endpoint_cache_key = self.cache_manager.get_cache_key(endpoint, {})
-                    endpoint_cache_files = [f for f in cache_files if endpoint_cache_key in f]
-                    if endpoint_cache_files:
-                        logging.info(f"Found {len(endpoint_cache_files)} cache files for {endpoint}: {', '.join(endpoint_cache_files)}")
-                    else:
-                        logging.info(f"No cache files found for {endpoint}")
         
-        all_data = []
-        records = 0
-        page_return = 150
+        all_data = None
         
-        # If in test mode and endpoint is "users", limit to one page
-        max_pages = 1 if self.test_mode and endpoint == "users" else float('inf')
-        current_page = 0
+        # Page-numbered endpoints are fetched concurrently; fall back to the
+        # serial since_id walk if the server rejects the page parameter
+        if endpoint in self.PAGED_ENDPOINTS and not self.test_mode:
+            all_data = self._get_pages_concurrently(endpoint, working_params, use_cache)
         
-        while True:
-            current_page += 1
+        if all_data is None:
+            all_data = self._get_pages_serially(endpoint, working_params, use_cache, limit_users)
+        
+        # Save the complete (or test-mode limited) dataset to cache
+        if should_use_cache and self.cache_manager:
+            logging.info(f"Saving {'limited' if limit_users else 'complete'} dataset to cache for {endpoint} ({len(all_data)} records)")
+            self.cache_manager.save_to_cache(endpoint, cache_params, all_data, ttl=self._cache_ttl(endpoint))
             
-            # If in test mode and we've reached the max pages, break
-            if self.test_mode and endpoint == "users" and current_page > max_pages:
-                logging.info(f"TEST MODE: Stopping after {max_pages} page(s) with {records} records")
-                break
-                
-            if records != 0 and all_data:
-                working_params['since_id'] = all_data[-1]['id']
-                
-            response = self._make_request(endpoint, params=working_params, use_cache=use_cache)
-            data = response.get('data', [])
+        return all_data
+    
+    def _get_pages_serially(self, endpoint: str, params: Dict, use_cache: Optional[bool] = None,
+                            limit_users: bool = False) -> List[Dict]:
+        """
+        Fetch every page of an endpoint by walking since_id.
+        
+        Args:
+            endpoint: API endpoint to call
+            params: Query parameters, including per_page; never modified
+            use_cache: Whether to use cache for this request
+            limit_users: Whether to stop after one page / test_limit records (test mode)
+            
+        Returns:
+            List of all data from all pages
+        """
+        all_data = []
+        
+        for data in self._iter_pages(endpoint, params, use_cache):
             all_data.extend(data)
             
-            records += len(data)
-            page_return = len(data)
+            # In test mode a single page is enough; trim to the exact limit
+            if limit_users:
+                logging.info(f"TEST MODE: Stopping after 1 page with {len(all_data)} records")
+                return all_data[:self.test_limit]
+        
+        logging.debug(f"Finished pagination: {len(all_data)} total records retrieved")
+        return all_data
+    
+    def _is_last_page(self, response: Dict, data: List[Dict], per_page: int) -> bool:
+        """
+        Decide whether a page is the last one, preferring the API's pagination metadata.
+        
+        A full final page is recognised from the metadata without requesting
+        an empty page after it. Cached responses carry only data, so they fall
+        back to checking for a short page.
+        
+        Args:
+            response: Full response for the page
+            data: Records on the page
+            per_page: Requested page size
             
-            # If in test mode and we have enough records, break
-            if self.test_mode and endpoint == "users" and records >= self.test_limit:
-                logging.info(f"TEST MODE: Reached limit of {self.test_limit} records, stopping pagination")
-                # Trim to exact limit
-                all_data = all_data[:self.test_limit]
-                break
-                
-            if page_return != 150:
-                logging.debug(f"Finished pagination: {records} total records retrieved")
-                
-                # Save the complete dataset to cache
-                if should_use_cache and self.cache_manager:
-                    # Use the same cache key format as when loading
-                    cache_params = working_params.copy()
-                    cache_params['complete_dataset'] = True
-                    
-                    # Remove the since_id parameter which is specific to pagination
-                    if 'since_id' in cache_params:
-                        del cache_params['since_id']
-                    
-                    logging.info(f"Saving complete dataset to cache for {endpoint} ({len(all_data)} records)")
-                    self.cache_manager.save_to_cache(endpoint, cache_params, all_data)
-                    
-                return all_data
+        Returns:
+            True if no further pages should be requested
+        """
+        meta = response.get('meta') or {}
+        pagination = meta.get('pagination') or meta
+        current_page = pagination.get('current_page')
+        total_pages = pagination.get('total_pages', pagination.get('last_page'))
+        if current_page is not None and total_pages is not None:
+            return int(current_page) >= int(total_pages)
         
-        # If we exited the loop due to test mode, save what we have to cache
-        if self.test_mode and endpoint == "users" and should_use_cache and self.cache_manager:
-            cache_params = working_params.copy()
-            cache_params['complete_dataset'] = True
-            cache_params['test_mode'] = True
+        links = response.get('links')
+        if isinstance(links, dict) and 'next' in links:
+            return not links['next']
+        
+        return len(data) < per_page
+    
+    def _iter_pages(self, endpoint: str, params: Dict, use_cache: Optional[bool] = None) -> Iterator[List[Dict]]:
+        """
+        Yield each page of an endpoint in turn, walking since_id.
+        
+        Args:
+            endpoint: API endpoint to call
+            params: Query parameters, including per_page; never modified
+            use_cache: Whether to use cache for this request
             
-            if 'since_id' in cache_params:
-                del cache_params['since_id']
+        Yields:
+            The records of one page
+        """
+        per_page = params.get('per_page', 150)
+        cursor = None
+        
+        while True:
+            page_params = params if cursor is None else {**params, 'since_id': cursor}
+            response = self._make_request(endpoint, params=page_params, use_cache=use_cache)
+            data = response.get('data', [])
+            yield data
             
-            logging.info(f"TEST MODE: Saving limited dataset to cache for {endpoint} ({len(all_data)} records)")
-            self.cache_manager.save_to_cache(endpoint, cache_params, all_data)
+            if not data or self._is_last_page(response, data, per_page):
+                return
             
-        return all_data
+            cursor = data[-1]['id']
+    
+    def get_all_data_streaming(self, endpoint: str, output_path: str, params: Optional[Dict] = None,
+                               use_cache: Optional[bool] = None) -> int:
+        """
+        Write all data from a paginated endpoint to an Arrow IPC file, page by page.
+        
+        Only one page is held in memory at a time, so large endpoints such as
+        hours can be exported without building a list of every record.
+        Callers read the result with pyarrow.ipc.open_file (memory-mapped)
+        or pandas.read_feather. The schema is taken from the first page;
+        fields missing from later pages are written as nulls.
+        
+        Args:
+            endpoint: API endpoint to call
+            output_path: Path of the Arrow file to write
+            params: Additional query parameters
+            use_cache: Whether to use cache for the page requests
+            
+        Returns:
+            Number of records written
+        """
+        import pyarrow as pa  # optional dependency, only needed for streaming exports
+        
+        working_params = {**(params or {}), 'per_page': 150, 'show_inactive': 'No'}
+        writer = None
+        records = 0
+        
+        try:
+            for data in self._iter_pages(endpoint, working_params, use_cache):
+                if not data:
+                    continue
+                if writer is None:
+                    table = pa.Table.from_pylist(data)
+                    schema = table.schema
+                    writer = pa.ipc.new_file(output_path, schema)
+                else:
+                    table = pa.Table.from_pylist(data, schema=schema)
+                writer.write_table(table)
+                records += len(data)
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        logging.info(f"Streamed {records} records from {endpoint} to {output_path}")
+        return records
+    
+    def _get_pages_concurrently(self, endpoint: str, params: Dict, use_cache: Optional[bool] = None,
+                                window: int = 4) -> Optional[List[Dict]]:
+        """
+        Fetch every page of a page-numbered endpoint, several pages at a time.
+        
+        Pages are requested in windows of `window` consecutive page numbers.
+        The dataset ends at an empty page (the API answers 404 "No results"
+        past the end) or at the page _is_last_page recognises as the last.
+        
+        Args:
+            endpoint: API endpoint to call
+            params: Query parameters, including per_page
+            use_cache: Whether to use cache for this request
+            window: Number of pages requested concurrently
+            
+        Returns:
+            List of all data from all pages, or None if the endpoint rejected
+            or ignored page-number pagination
+        """
+        per_page = params.get('per_page', 150)
+        
+        def fetch(page):
+            page_params = params.copy()
+            page_params['page'] = page
+            return self._make_request(endpoint, params=page_params, handle_404=True, use_cache=use_cache)
+        
+        all_data = []
+        next_page = 1
+        previous_first_id = None
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=window) as executor:
+                while True:
+                    for response in executor.map(fetch, range(next_page, next_page + window)):
+                        data = response.get('data', [])
+                        if not data:
+                            return all_data
+                        
+                        # A server that ignores `page` returns the same page forever
+                        first_id = data[0].get('id')
+                        if first_id is not None and first_id == previous_first_id:
+                            logging.warning(f"{endpoint} repeated a page, falling back to since_id")
+                            return None
+                        previous_first_id = first_id
+                        
+                        all_data.extend(data)
+                        if self._is_last_page(response, data, per_page):
+                            return all_data
+                    next_page += window
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 400:
+                logging.info(f"{endpoint} rejected page-number pagination, falling back to since_id")
+                return None
+            raise
     
     def get_volunteers(self, params: Optional[Dict] = None, use_cache: Optional[bool] = None) -> List[Dict]:
         """
@@ -582,19 +979,25 @@ class GalaxyDigitalAPI:
         Returns:
             List of volunteer addresses
         """
+        import pandas as pd  # heavy import, only needed here
+        
         volunteers = self.get_volunteers(use_cache=use_cache)
-        addresses = []
+        if not volunteers:
+            return []
+        
+        # Filter and build the name column column-wise instead of per record;
+        # dtype=object keeps IDs as returned rather than coercing to float
+        df = pd.DataFrame(volunteers, columns=['first_name', 'last_name', 'email', 'address', 'id'], dtype=object)
+        df = df[df['address'].notna() & df['address'].astype(bool)]
         
-        for volunteer in volunteers:
-            if 'address' in volunteer and volunteer['address']:
-                addresses.append({
-                    'name': f"{volunteer.get('first_name', '')} {volunteer.get('last_name', '')}",
-                    'email': volunteer.get('email', ''),
-                    'address': volunteer['address'],
-                    'volunteer_id': volunteer.get('id')
-                })
+        addresses = pd.DataFrame({
+            'name': df['first_name'].fillna('') + ' ' + df['last_name'].fillna(''),
+            'email': df['email'].fillna(''),
+            'address': df['address'],
+            'volunteer_id': df['id'].where(df['id'].notna(), None),
+        })
         
-        return addresses
+        return addresses.to_dict('records')
         
     def clear_cache(self, older_than_days: Optional[int] = None) -> int:
         """
@@ -625,19 +1028,116 @@ class GalaxyDigitalAPI:
             
         return self.cache_manager.get_cache_stats()
     
-    def get_detailed_volunteers(self, volunteer_ids: List[str], use_cache: Optional[bool] = None) -> List[Dict]:
+    def get_volunteers_by_ids(self, volunteer_ids: List[str], use_cache: Optional[bool] = None,
+                              chunk_size: int = 50) -> Optional[List[Dict]]:
         """
-        Get detailed information for a list of volunteers.
+        Get volunteers by ID with one list request per chunk of IDs.
+        
+        The id_in filter is not part of the documented API, so the first
+        response is checked: if it contains volunteers that were not asked
+        for, the server ignored the filter and None is returned. An empty
+        first response (or 404 "No results") says nothing either way, so
+        None is returned without deciding and the next call probes again.
         
         Args:
             volunteer_ids: List of volunteer IDs
             use_cache: Whether to use cache for this request
+            chunk_size: Number of IDs per request
+            
+        Returns:
+            List of volunteer data, or None if the server does not support id_in
+        """
+        if self._supports_id_in is False:
+            return None
+        
+        volunteers = []
+        for start_idx in range(0, len(volunteer_ids), chunk_size):
+            chunk = [str(volunteer_id) for volunteer_id in volunteer_ids[start_idx:start_idx + chunk_size]]
+            params = {'id_in': ','.join(chunk), 'per_page': 150}
+            try:
+                data = self._make_request("users", params=params, handle_404=True, use_cache=use_cache).get('data', [])
+            except requests.exceptions.HTTPError as e:
+                if self._supports_id_in is None and e.response is not None and e.response.status_code in (400, 422):
+                    self._supports_id_in = False
+                    return None
+                raise
+            
+            if self._supports_id_in is None:
+                if not data:
+                    logging.info("id_in probe returned no volunteers, fetching volunteers individually")
+                    return None
+                requested = set(chunk)
+                self._supports_id_in = all(str(volunteer.get('id')) in requested for volunteer in data)
+                if not self._supports_id_in:
+                    logging.info("users endpoint ignores id_in, fetching volunteers individually")
+                    return None
+            
+            volunteers.extend(data)
+        
+        return volunteers
+    
+    def _fetch_volunteers_individually(self, volunteer_ids: List[str], use_cache: Optional[bool],
+                                       max_workers: int) -> List[Dict]:
+        """
+        Get volunteers one request per ID, several requests at a time.
+        
+        Args:
+            volunteer_ids: List of volunteer IDs
+            use_cache: Whether to use cache for this request
+            max_workers: Maximum number of concurrent requests
             
         Returns:
             List of detailed volunteer data
         """
         detailed_volunteers = []
         
+        # If we have a lot of IDs, process them in batches so progress is logged
+        # and the connection pool is never oversubscribed
+        batch_size = 100
+        total_batches = (len(volunteer_ids) + batch_size - 1) // batch_size
+        
+        logging.info(f"Getting detailed data for {len(volunteer_ids)} volunteers in {total_batches} batches")
+        
+        def fetch(volunteer_id):
+            try:
+                return self.get_volunteer(volunteer_id, use_cache=use_cache)
+            except Exception as e:
+                logging.warning(f"Error getting detailed data for volunteer {volunteer_id}: {str(e)}")
+                return None
+        
+        # The worker cap bounds concurrency against the API instead of sleeping
+        # between batches; per-ID cache hits return without touching the network
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch_num in range(total_batches):
+                start_idx = batch_num * batch_size
+                end_idx = min(start_idx + batch_size, len(volunteer_ids))
+                batch_ids = volunteer_ids[start_idx:end_idx]
+                
+                logging.info(f"Processing batch {batch_num + 1}/{total_batches} with {len(batch_ids)} volunteers")
+                
+                # map preserves input order so results line up with volunteer_ids
+                for volunteer_data in executor.map(fetch, batch_ids):
+                    if volunteer_data:
+                        detailed_volunteers.append(volunteer_data)
+                
+                # Log progress
+                logging.info(f"Completed batch {batch_num + 1}/{total_batches}, retrieved {len(detailed_volunteers)} volunteers so far")
+        
+        return detailed_volunteers
+    
+    def get_detailed_volunteers(self, volunteer_ids: List[str], use_cache: Optional[bool] = None,
+                                max_workers: int = 20) -> List[Dict]:
+        """
+        Get detailed information for a list of volunteers.
+        
+        Args:
+            volunteer_ids: List of volunteer IDs
+            use_cache: Whether to use cache for this request
+            max_workers: Maximum number of concurrent requests
+            
+        Returns:
+            List of detailed volunteer data
+        """
         # Check if we have a complete cached dataset first
         if self.use_cache if use_cache is None else use_cache:
             if self.cache_manager:
@@ -649,33 +1149,11 @@ class GalaxyDigitalAPI:
                     logging.info(f"Using cached detailed volunteer data for {len(cached_data)} volunteers")
                     return cached_data
         
-        # If we have a lot of IDs, process them in batches to avoid rate limiting
-        batch_size = 100
-        total_batches = (len(volunteer_ids) + batch_size - 1) // batch_size
-        
-        logging.info(f"Getting detailed data for {len(volunteer_ids)} volunteers in {total_batches} batches")
-        
-        for batch_num in range(total_batches):
-            start_idx = batch_num * batch_size
-            end_idx = min(start_idx + batch_size, len(volunteer_ids))
-            batch_ids = volunteer_ids[start_idx:end_idx]
-            
-            logging.info(f"Processing batch {batch_num + 1}/{total_batches} with {len(batch_ids)} volunteers")
-            
-            # Add a small delay between batches to avoid rate limiting
-            if batch_num > 0:
-                time.sleep(1)
-                
-            for volunteer_id in batch_ids:
-                try:
-                    volunteer_data = self.get_volunteer(volunteer_id, use_cache=use_cache)
-                    if volunteer_data:
-                        detailed_volunteers.append(volunteer_data)
-                except Exception as e:
-                    logging.warning(f"Error getting detailed data for volunteer {volunteer_id}: {str(e)}")
-            
-            # Log progress
-            logging.info(f"Completed batch {batch_num + 1}/{total_batches}, retrieved {len(detailed_volunteers)} volunteers so far")
+        # Collapse lookups into one list request per chunk of IDs where the
+        # server supports it, otherwise fan out one request per volunteer
+        detailed_volunteers = self.get_volunteers_by_ids(volunteer_ids, use_cache=use_cache)
+        if detailed_volunteers is None:
+            detailed_volunteers = self._fetch_volunteers_individually(volunteer_ids, use_cache, max_workers)
         
         # Save to cache if enabled
         if self.use_cache if use_cache is None else use_cache:
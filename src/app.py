@@ -5,17 +5,17 @@ import numpy as np
 import json
 import logging
 from datetime import datetime, timedelta
-from dotenv import load_dotenv
 import folium
 import time
+import threading
+import streamlit.components.v1 as components
 
-# Load environment variables
-load_dotenv()
-
-# Import components
+# Import components (utils.config loads .env once per process)
+from utils.config import env_config
 from api.galaxy_digital import GalaxyDigitalAPI
 from utils.data_service import DataService
-from utils.geocoding import batch_geocode
+from utils.geocoding import batch_geocode, clear_geocode_cache
+from utils.geo import haversine_km
 from components.map_component import create_map, display_map, add_reference_marker
 from components.chart_component import (
     create_hours_histogram, create_hours_by_month_chart, create_top_volunteers_chart,
@@ -34,6 +34,153 @@ logging.basicConfig(
 st.set_page_config(page_title="Volunteer Analysis Dashboard", layout="wide")
 
 
+def _data_key(data_service):
+    """
+    Key for cached results derived from the loaded DataFrames.
+    
+    DataService bumps data_version every time it rebuilds or patches its
+    DataFrames, and versions are unique across the process, so the key
+    changes with the data and never collides between sessions.
+    """
+    return data_service.data_version
+
+
+@st.cache_data(ttl=3600, max_entries=8)
+def _cached_hours_summary(data_key, _data_service):
+    """Hours summary for the data identified by data_key."""
+    return _data_service.get_volunteer_hours_summary()
+
+
+@st.cache_data(ttl=3600, max_entries=8)
+def _cached_participation_metrics(data_key, _data_service):
+    """Opportunity participation metrics for the data identified by data_key."""
+    return _data_service.get_opportunity_participation_metrics()
+
+
+@st.cache_data(ttl=3600, max_entries=8)
+def _cached_engagement_metrics(data_key, _data_service):
+    """Volunteer engagement metrics for the data identified by data_key."""
+    return _data_service.get_volunteer_engagement_metrics()
+
+
+@st.cache_data(ttl=3600, max_entries=8)
+def _cached_participation(data_key, _data_service):
+    """Per-opportunity participation DataFrame for the data identified by data_key."""
+    return _data_service.get_opportunity_participation()
+
+
+@st.cache_resource(ttl=3600, max_entries=32)
+def _cached_chart(data_key, chart_name, _build):
+    """Chart figure `chart_name` for the data identified by data_key, built once by _build()."""
+    return _build()
+
+
+@st.cache_data(ttl=3600, max_entries=16)
+def _cached_map_html(data_key, _volunteer_df, ref_lat, ref_lng, heatmap, radius,
+                     show_markers, show_dots, marker_size, color_by, exclude_zip_only):
+    """Rendered HTML of the volunteer map for the given data and display options."""
+    m = create_map(
+        _volunteer_df,
+        center=[ref_lat, ref_lng],
+        heatmap=heatmap,
+        radius=radius,
+        show_markers=show_markers,
+        show_dots=show_dots,
+        marker_size=marker_size,
+        color_by=color_by,
+        exclude_zip_only=exclude_zip_only
+    )
+    m = add_reference_marker(m, ref_lat, ref_lng)
+    return m.get_root().render()
+
+
+def _background_init(api_client, status):
+    """
+    Log in and auto-load addresses.geojson off the script thread.
+    
+    Touches no Streamlit APIs; outcomes are recorded in status for the next
+    rerun to report. The GeoJSON is loaded into a separate DataService so
+    the script thread never renders a half-built one.
+    
+    Args:
+        api_client: Galaxy Digital API client created with skip_login=True
+        status: Dictionary shared with the script thread
+    """
+    try:
+        status['logged_in'] = api_client.login()
+    except Exception as e:
+        logging.error(f"API login error: {str(e)}", exc_info=True)
+        status['logged_in'] = False
+    
+    # Automatically load addresses.geojson if it exists
+    if os.path.exists("addresses.geojson"):
+        try:
+            logging.info("Automatically loading data from addresses.geojson")
+            data_service = DataService(api_client=api_client)
+            data_service.load_from_geojson("addresses.geojson")
+            
+            # Fix any incorrect hour values
+            status['fixed_count'] = data_service.fix_hour_values()
+            status['data_service'] = data_service
+        except Exception as e:
+            logging.error(f"Error auto-loading addresses.geojson: {str(e)}")
+            status['load_failed'] = True
+    
+    status['done'] = True
+
+
+@st.fragment(run_every=1)
+def _init_progress():
+    """Placeholder shown until background initialization finishes, then triggers a full rerun."""
+    if st.session_state.init_status.get('done'):
+        st.rerun()
+    st.info("Connecting to Galaxy Digital API and loading local data...")
+
+
+def _report_init_status():
+    """Show the outcome of background initialization once, swapping in auto-loaded data."""
+    status = st.session_state.init_status
+    if status.get('reported'):
+        return
+    if not status.get('done'):
+        _init_progress()
+        return
+    status['reported'] = True
+    
+    if status.get('logged_in'):
+        st.success("Successfully connected to Galaxy Digital API")
+    else:
+        st.error("Failed to authenticate with Galaxy Digital API. Check your credentials in .env file.")
+        st.info("You can still use the application with local data files.")
+    
+    data_service = status.pop('data_service', None)
+    if data_service is not None and not st.session_state.data_service.volunteers:
+        st.session_state.data_service = data_service
+        if status.get('fixed_count', 0) > 0:
+            st.info(f"Fixed {status['fixed_count']} hour values in the loaded data")
+        st.success(f"Successfully loaded {len(data_service.volunteers)} volunteers from addresses.geojson")
+    elif status.get('load_failed'):
+        st.warning("Could not automatically load addresses.geojson. You can try loading it manually.")
+
+
+def _located_volunteers(volunteer_df):
+    """
+    Rows of volunteer_df that have coordinates.
+    
+    Memoized in session state until DataService replaces volunteer_df, so
+    reruns that don't touch the data skip the dropna copy.
+    """
+    cached = st.session_state.get('located_volunteers')
+    if cached is None or cached[0] is not volunteer_df:
+        if 'latitude' in volunteer_df.columns and 'longitude' in volunteer_df.columns:
+            located = volunteer_df.dropna(subset=['latitude', 'longitude'])
+        else:
+            located = volunteer_df.iloc[0:0]
+        cached = (volunteer_df, located)
+        st.session_state.located_volunteers = cached
+    return cached[1]
+
+
 def main():
     """Main application function."""
     st.title("Volunteer Analysis Dashboard")
@@ -62,30 +209,15 @@ def main():
             api_client = GalaxyDigitalAPI(debug=debug_mode, skip_login=True, 
                                          test_mode=test_mode, test_limit=test_limit)
             
-            # Attempt to login and show appropriate messages
-            if api_client.login():
-                st.success("Successfully connected to Galaxy Digital API")
-            else:
-                st.error("Failed to authenticate with Galaxy Digital API. Check your credentials in .env file.")
-                st.info("You can still use the application with local data files.")
-            
             st.session_state.data_service = DataService(api_client=api_client)
             
-            # Automatically load addresses.geojson if it exists
-            if os.path.exists("addresses.geojson"):
-                try:
-                    logging.info("Automatically loading data from addresses.geojson")
-                    st.session_state.data_service.load_from_geojson("addresses.geojson")
-                    
-                    # Fix any incorrect hour values
-                    fixed_count = st.session_state.data_service.fix_hour_values()
-                    if fixed_count > 0:
-                        st.info(f"Fixed {fixed_count} hour values in the loaded data")
-                        
-                    st.success(f"Successfully loaded {len(st.session_state.data_service.volunteers)} volunteers from addresses.geojson")
-                except Exception as e:
-                    logging.error(f"Error auto-loading addresses.geojson: {str(e)}")
-                    st.warning("Could not automatically load addresses.geojson. You can try loading it manually.")
+            # Login and auto-load run in the background so the page paints immediately
+            st.session_state.init_status = {}
+            threading.Thread(
+                target=_background_init,
+                args=(api_client, st.session_state.init_status),
+                daemon=True
+            ).start()
         except Exception as e:
             st.error(f"Error initializing API client: {str(e)}")
             logging.error(f"API client initialization error: {str(e)}", exc_info=True)
@@ -93,6 +225,9 @@ def main():
             # Create data service without API client
             st.session_state.data_service = DataService(api_client=None)
     
+    if 'init_status' in st.session_state:
+        _report_init_status()
+    
     if 'ref_lat' not in st.session_state:
         st.session_state.ref_lat = 41.9067
     
@@ -110,10 +245,11 @@ def main():
         
         if data_source == "Galaxy Digital API":
             # Use environment variables for API credentials instead of text inputs
-            api_key = os.getenv("GALAXY_API_KEY", "")
-            email = os.getenv("GALAXY_EMAIL", "")
-            password = os.getenv("GALAXY_PASSWORD", "")
-            base_url = os.getenv("GALAXY_BASE_URL", "https://api.galaxydigital.com/api")
+            config = env_config()
+            api_key = config['api_key']
+            email = config['email']
+            password = config['password']
+            base_url = config['base_url']
             
             # Display credential status
             if api_key and email and password:
@@ -134,7 +270,7 @@ def main():
             if st.session_state.data_service and st.session_state.data_service.api_available:
                 api_client = st.session_state.data_service.api_client
                 
-                if hasattr(api_client, 'cache_manager') and api_client.cache_manager:
+                if api_client.cache_manager:
                     # Get cache stats
                     cache_stats = api_client.get_cache_stats()
                     
@@ -195,8 +331,8 @@ def main():
                             test_limit=test_limit
                         )
                         
-                        # Attempt to login
-                        if not api_client.login():
+                        # The constructor already authenticated (or reused a cached token); only retry if that failed
+                        if not api_client.token and not api_client.login():
                             st.error("Failed to authenticate with Galaxy Digital API. Please check your credentials.")
                             st.stop()
                         
@@ -238,7 +374,7 @@ def main():
                             st.error(f"Error loading data: {str(e)}")
                             
                             # Check if we have partial data that we can still use
-                            if hasattr(st.session_state.data_service, 'volunteers') and len(st.session_state.data_service.volunteers) > 0:
+                            if len(st.session_state.data_service.volunteers) > 0:
                                 st.warning(f"Partial data was loaded: {len(st.session_state.data_service.volunteers)} volunteers. Some functionality may be limited.")
                                 
                                 # Try to create dataframes from partial data
@@ -257,14 +393,10 @@ def main():
             )
             
             if uploaded_file is not None:
-                # Save the uploaded file temporarily
-                with open("temp_upload.geojson", "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-                
-                # Load data from file
+                # Load data straight from the upload stream
                 with st.spinner("Loading data from GeoJSON file..."):
                     try:
-                        st.session_state.data_service.load_from_geojson("temp_upload.geojson")
+                        st.session_state.data_service.load_from_geojson(uploaded_file)
                         
                         # Fix any incorrect hour values
                         fixed_count = st.session_state.data_service.fix_hour_values()
@@ -301,7 +433,7 @@ def main():
         
         # Google Maps API key from environment
         st.header("Geocoding Settings")
-        google_maps_api_key = os.getenv("GOOGLE_MAPS_API_KEY", "")
+        google_maps_api_key = env_config()['google_maps_api_key']
         
         if google_maps_api_key:
             st.success("Google Maps API key loaded from environment variables")
@@ -309,8 +441,13 @@ def main():
             st.warning("Google Maps API key not found in environment variables. Please set GOOGLE_MAPS_API_KEY in your .env file.")
             st.info("Required for geocoding addresses. Get a key from https://developers.google.com/maps/documentation/geocoding/get-api-key")
         
+        if st.button("Clear Geocode Cache"):
+            with st.spinner("Clearing geocode cache..."):
+                cleared = clear_geocode_cache()
+                st.success(f"Cleared {cleared} geocode cache files")
+        
         # Geocode button (only show if we have volunteer data)
-        if hasattr(st.session_state, 'data_service') and hasattr(st.session_state.data_service, 'volunteers') and len(st.session_state.data_service.volunteers) > 0:
+        if len(st.session_state.data_service.volunteers) > 0:
             exclude_zip_only_geocoding = st.checkbox("Skip Zip Code-Only Addresses When Geocoding", value=False,
                                                    help="Don't geocode addresses that only have zip codes")
             
@@ -320,37 +457,39 @@ def main():
                 else:
                     with st.spinner("Geocoding volunteer addresses..."):
                         try:
-                            # Prepare addresses for geocoding
-                            addresses_to_geocode = []
+                            # Prepare addresses for geocoding from the volunteer DataFrame,
+                            # using column-wise masks rather than a loop over volunteers
+                            df = st.session_state.data_service.volunteer_df
+                            
+                            def present(column):
+                                return df[column].fillna('').astype(bool)
+                            
+                            # Skip volunteers that already have (non-zero) coordinates
+                            has_coords = (df['latitude'].notna() & df['longitude'].notna() &
+                                          df['latitude'].ne(0) & df['longitude'].ne(0))
+                            has_address, has_zip = present('address'), present('zip_code')
+                            is_zip_only = has_zip & ~has_address & ~present('city') & ~present('state')
+                            
+                            already_geocoded = int(has_coords.sum())
+                            candidates = ~has_coords
+                            
+                            # Skip zip code only addresses if requested
                             skipped_zip_only = 0
-                            already_geocoded = 0
+                            if exclude_zip_only_geocoding:
+                                skipped_zip_only = int((candidates & is_zip_only).sum())
+                                candidates &= ~is_zip_only
                             
-                            for volunteer in st.session_state.data_service.volunteers:
-                                # Skip volunteers that already have coordinates
-                                if hasattr(volunteer, 'latitude') and hasattr(volunteer, 'longitude') and volunteer.latitude and volunteer.longitude:
-                                    already_geocoded += 1
-                                    continue
-                                    
-                                # Check if this is a zip code only address
-                                is_zip_only = bool(volunteer.zip_code and not volunteer.address and not volunteer.city and not volunteer.state)
-                                
-                                # Skip zip code only addresses if requested
-                                if exclude_zip_only_geocoding and is_zip_only:
-                                    skipped_zip_only += 1
-                                    continue
-                                
-                                if volunteer.address:
-                                    full_address = f"{volunteer.address}, {volunteer.city}, {volunteer.state} {volunteer.zip_code}"
-                                    addresses_to_geocode.append({
-                                        'id': volunteer.id,
-                                        'address': full_address
-                                    })
-                                elif volunteer.zip_code and not exclude_zip_only_geocoding:
-                                    # If we only have a zip code, use that
-                                    addresses_to_geocode.append({
-                                        'id': volunteer.id,
-                                        'address': volunteer.zip_code
-                                    })
+                            # Use the full street address where there is one, otherwise the zip code
+                            full_address = (df['address'].fillna('').astype(str) + ', ' +
+                                            df['city'].fillna('').astype(str) + ', ' +
+                                            df['state'].fillna('').astype(str) + ' ' +
+                                            df['zip_code'].fillna('').astype(str))
+                            zip_fallback = ~has_address & has_zip & (not exclude_zip_only_geocoding)
+                            to_geocode = pd.DataFrame({
+                                'id': df['id'],
+                                'address': full_address.where(has_address, df['zip_code']),
+                            })[candidates & (has_address | zip_fallback)]
+                            addresses_to_geocode = to_geocode.to_dict('records')
                             
                             # Show progress
                             progress_text = st.empty()
@@ -379,27 +518,13 @@ def main():
                                 addresses_to_geocode, 
                                 api_key=google_maps_api_key,
                                 exclude_zip_only=exclude_zip_only_geocoding,
+                                max_workers=20,
                                 progress_callback=progress_callback
                             )
                             end_time = time.time()
                             
-                            # Update volunteer objects with geocoded coordinates
-                            geocoded_count = 0
-                            for geocoded in geocoded_addresses:
-                                if not geocoded:
-                                    continue
-                                    
-                                for volunteer in st.session_state.data_service.volunteers:
-                                    if volunteer.id == geocoded['id']:
-                                        volunteer.latitude = geocoded['latitude']
-                                        volunteer.longitude = geocoded['longitude']
-                                        if 'is_zip_only' in geocoded:
-                                            setattr(volunteer, 'is_zip_only', geocoded['is_zip_only'])
-                                        geocoded_count += 1
-                                        break
-                            
-                            # Recreate dataframes with the updated coordinates
-                            st.session_state.data_service._create_dataframes()
+                            # Patch the new coordinates into the volunteers and volunteer_df in place
+                            geocoded_count = st.session_state.data_service.update_coordinates(geocoded_addresses)
                             
                             # Save the updated data to GeoJSON
                             st.session_state.data_service.save_volunteer_geojson()
@@ -422,7 +547,7 @@ def main():
                             logging.error(f"Geocoding error: {str(e)}", exc_info=True)
         
         # Map options
-        if hasattr(st.session_state.data_service, 'volunteer_df') and st.session_state.data_service.volunteer_df is not None:
+        if st.session_state.data_service.volunteer_df is not None:
             st.header("Map Options")
             
             # Add a button to fix hour values
@@ -454,7 +579,7 @@ def main():
                 color_by_column = "engagement_score"
     
     # Main content area
-    if hasattr(st.session_state.data_service, 'volunteer_df') and st.session_state.data_service.volunteer_df is not None:
+    if st.session_state.data_service.volunteer_df is not None:
         # Create tabs for different visualizations
         tab1, tab2, tab3, tab4 = st.tabs([
             "Map View", 
@@ -467,12 +592,8 @@ def main():
             st.header("Volunteer Locations")
             
             # Check if we have any volunteers with coordinates
-            has_coordinates = False
-            if hasattr(st.session_state.data_service, 'volunteer_df') and st.session_state.data_service.volunteer_df is not None:
-                if 'latitude' in st.session_state.data_service.volunteer_df.columns and 'longitude' in st.session_state.data_service.volunteer_df.columns:
-                    # Check if we have any non-null coordinates
-                    valid_coords = st.session_state.data_service.volunteer_df.dropna(subset=['latitude', 'longitude'])
-                    has_coordinates = len(valid_coords) > 0
+            valid_coords = _located_volunteers(st.session_state.data_service.volunteer_df)
+            has_coordinates = len(valid_coords) > 0
             
             if not has_coordinates:
                 st.warning("No volunteers with coordinates found. Please use the geocoding feature in the sidebar to add coordinates.")
@@ -487,8 +608,8 @@ def main():
                     st.session_state.ref_lng
                 )
                 
-                # Display the map
-                map_data = display_map(m, height=600)
+                # Display the map; only clicks rerun the script, not panning or zooming
+                map_data = display_map(m, height=600, returned_objects=["last_clicked"])
                 
                 # Update reference point if map was clicked
                 if map_data["last_clicked"] is not None:
@@ -497,36 +618,58 @@ def main():
                     st.success(f"Reference point updated to: {st.session_state.ref_lat:.6f}, {st.session_state.ref_lng:.6f}")
                     st.rerun()
             else:
+                pick_reference = st.checkbox("Click map to set reference point", value=False,
+                                             help="Makes the map interactive so a click moves the reference point; "
+                                                  "the map is re-rendered on every interaction while enabled")
+                
                 # Create map with current reference point
                 try:
-                    m = create_map(
-                        st.session_state.data_service.volunteer_df,
-                        center=[st.session_state.ref_lat, st.session_state.ref_lng],
-                        heatmap=show_heatmap,
-                        radius=heatmap_radius,
-                        show_markers=show_markers,
-                        show_dots=show_dots,
-                        marker_size=marker_size,
-                        color_by=color_by_column,
-                        exclude_zip_only=exclude_zip_only
-                    )
-                    
-                    # Add reference point marker
-                    m = add_reference_marker(
-                        m,
-                        st.session_state.ref_lat,
-                        st.session_state.ref_lng
-                    )
-                    
-                    # Display the map
-                    map_data = display_map(m, height=600)
-                    
-                    # Update reference point if map was clicked
-                    if map_data["last_clicked"] is not None:
-                        st.session_state.ref_lat = map_data["last_clicked"]["lat"]
-                        st.session_state.ref_lng = map_data["last_clicked"]["lng"]
-                        st.success(f"Reference point updated to: {st.session_state.ref_lat:.6f}, {st.session_state.ref_lng:.6f}")
-                        st.rerun()
+                    if pick_reference:
+                        m = create_map(
+                            st.session_state.data_service.volunteer_df,
+                            center=[st.session_state.ref_lat, st.session_state.ref_lng],
+                            heatmap=show_heatmap,
+                            radius=heatmap_radius,
+                            show_markers=show_markers,
+                            show_dots=show_dots,
+                            marker_size=marker_size,
+                            color_by=color_by_column,
+                            exclude_zip_only=exclude_zip_only
+                        )
+                        
+                        # Add reference point marker
+                        m = add_reference_marker(
+                            m,
+                            st.session_state.ref_lat,
+                            st.session_state.ref_lng
+                        )
+                        
+                        # Display the map; only clicks rerun the script and rebuild it,
+                        # not panning or zooming
+                        map_data = display_map(m, height=600, returned_objects=["last_clicked"])
+                        
+                        # Update reference point if map was clicked
+                        if map_data["last_clicked"] is not None:
+                            st.session_state.ref_lat = map_data["last_clicked"]["lat"]
+                            st.session_state.ref_lng = map_data["last_clicked"]["lng"]
+                            st.success(f"Reference point updated to: {st.session_state.ref_lat:.6f}, {st.session_state.ref_lng:.6f}")
+                            st.rerun()
+                    else:
+                        # Static map: reuse the rendered HTML until the data or display options change
+                        map_html = _cached_map_html(
+                            _data_key(st.session_state.data_service),
+                            st.session_state.data_service.volunteer_df,
+                            st.session_state.ref_lat,
+                            st.session_state.ref_lng,
+                            show_heatmap,
+                            heatmap_radius,
+                            show_markers,
+                            show_dots,
+                            marker_size,
+                            color_by_column,
+                            exclude_zip_only
+                        )
+                        components.html(map_html, height=600)
                 except Exception as e:
                     st.error(f"Error creating map: {str(e)}")
                     logging.error(f"Map creation error: {str(e)}", exc_info=True)
@@ -535,14 +678,29 @@ def main():
                     # Show a placeholder map
                     m = folium.Map(location=[st.session_state.ref_lat, st.session_state.ref_lng], zoom_start=10)
                     display_map(m, height=600)
+                
+                # Nearest volunteers to the reference point, measured across the whole column at once
+                with st.expander("Closest Volunteers to Reference Point"):
+                    located = valid_coords
+                    distances = located[['name', 'address', 'total_hours']].assign(
+                        distance_km=haversine_km(
+                            located['latitude'].to_numpy(),
+                            located['longitude'].to_numpy(),
+                            st.session_state.ref_lat,
+                            st.session_state.ref_lng
+                        ).round(2)
+                    )
+                    st.dataframe(distances.nsmallest(20, 'distance_km'), hide_index=True)
         
         with tab2:
             st.header("Volunteer Analysis")
             
             # Summary metrics
-            if hasattr(st.session_state.data_service, 'hours_df') and st.session_state.data_service.hours_df is not None:
+            if st.session_state.data_service.hours_df is not None:
                 try:
-                    hours_summary = st.session_state.data_service.get_volunteer_hours_summary()
+                    # Aggregations and figures are reused across reruns until the data changes
+                    data_key = _data_key(st.session_state.data_service)
+                    hours_summary = _cached_hours_summary(data_key, st.session_state.data_service)
                     
                     # Display summary metrics in columns
                     col1, col2, col3, col4 = st.columns(4)
@@ -562,23 +720,23 @@ def main():
                     # Hours distribution
                     st.subheader("Hours Distribution")
                     if 'total_hours' in st.session_state.data_service.volunteer_df.columns:
-                        hours_hist = create_hours_histogram(
+                        hours_hist = _cached_chart(data_key, "hours_histogram", lambda: create_hours_histogram(
                             st.session_state.data_service.volunteer_df,
                             hours_column='total_hours',
                             title="Volunteer Hours Distribution"
-                        )
-                        st.pyplot(hours_hist)
+                        ))
+                        st.plotly_chart(hours_hist, use_container_width=True)
                     else:
                         st.info("No hours data available for distribution chart.")
                     
                     # Hours by month
                     st.subheader("Hours by Month")
                     if 'hours_by_month' in hours_summary and hours_summary['hours_by_month']:
-                        hours_month_chart = create_hours_by_month_chart(
+                        hours_month_chart = _cached_chart(data_key, "hours_by_month", lambda: create_hours_by_month_chart(
                             hours_summary['hours_by_month'],
                             title="Volunteer Hours by Month"
-                        )
-                        st.pyplot(hours_month_chart)
+                        ))
+                        st.plotly_chart(hours_month_chart, use_container_width=True)
                     else:
                         st.info("No monthly data available.")
                     
@@ -588,22 +746,22 @@ def main():
                     
                     with col1:
                         if 'top_volunteers' in hours_summary and hours_summary['top_volunteers']:
-                            top_vol_chart = create_top_volunteers_chart(
+                            top_vol_chart = _cached_chart(data_key, "top_volunteers", lambda: create_top_volunteers_chart(
                                 hours_summary['top_volunteers'],
                                 title="Top Volunteers by Hours"
-                            )
-                            st.pyplot(top_vol_chart)
+                            ))
+                            st.plotly_chart(top_vol_chart, use_container_width=True)
                         else:
                             st.info("No volunteer data available for top volunteers chart.")
                     
                     with col2:
                         # Cumulative hours chart
                         if 'total_hours' in st.session_state.data_service.volunteer_df.columns:
-                            hours_cum_chart = create_hours_cumulative_chart(
+                            hours_cum_chart = _cached_chart(data_key, "hours_cumulative", lambda: create_hours_cumulative_chart(
                                 st.session_state.data_service.volunteer_df,
                                 hours_column='total_hours',
                                 title="Cumulative Volunteer Hours"
-                            )
+                            ))
                             st.plotly_chart(hours_cum_chart, use_container_width=True)
                         else:
                             st.info("No hours data available for cumulative chart.")
@@ -617,10 +775,11 @@ def main():
         with tab3:
             st.header("Opportunity Analysis")
             
-            if hasattr(st.session_state.data_service, 'hours_df') and st.session_state.data_service.hours_df is not None:
+            if st.session_state.data_service.hours_df is not None:
                 try:
-                    hours_summary = st.session_state.data_service.get_volunteer_hours_summary()
-                    participation_metrics = st.session_state.data_service.get_opportunity_participation_metrics()
+                    data_key = _data_key(st.session_state.data_service)
+                    hours_summary = _cached_hours_summary(data_key, st.session_state.data_service)
+                    participation_metrics = _cached_participation_metrics(data_key, st.session_state.data_service)
                     
                     # Display summary metrics in columns
                     col1, col2 = st.columns(2)
@@ -640,11 +799,11 @@ def main():
                     # Top opportunities
                     st.subheader("Top Opportunities")
                     if 'top_opportunities' in hours_summary and hours_summary['top_opportunities']:
-                        top_opp_chart = create_top_opportunities_chart(
+                        top_opp_chart = _cached_chart(data_key, "top_opportunities", lambda: create_top_opportunities_chart(
                             hours_summary['top_opportunities'],
                             title="Top Opportunities by Hours"
-                        )
-                        st.pyplot(top_opp_chart)
+                        ))
+                        st.plotly_chart(top_opp_chart, use_container_width=True)
                     else:
                         st.info("No opportunity data available for top opportunities chart.")
                     
@@ -654,44 +813,16 @@ def main():
                     # Create DataFrame for participation chart
                     if 'most_popular_opportunities' in participation_metrics and participation_metrics['most_popular_opportunities']:
                         # Check if we have the necessary data for the participation chart
-                        if hasattr(st.session_state.data_service, 'hours_df') and 'opportunity_id' in st.session_state.data_service.hours_df.columns:
+                        if st.session_state.data_service.hours_df is not None and 'opportunity_id' in st.session_state.data_service.hours_df.columns:
                             try:
-                                # Extract participation data
-                                participation_data = []
-                                
-                                for opportunity_id in st.session_state.data_service.hours_df['opportunity_id'].unique():
-                                    if not opportunity_id:  # Skip empty opportunity IDs
-                                        continue
-                                        
-                                    opportunity_hours = st.session_state.data_service.hours_df[
-                                        st.session_state.data_service.hours_df['opportunity_id'] == opportunity_id
-                                    ]
-                                    volunteers = opportunity_hours['volunteer_id'].unique()
-                                    total_hours = opportunity_hours['hours'].sum()
-                                    avg_hours = total_hours / len(volunteers) if len(volunteers) > 0 else 0
-                                    
-                                    # Get opportunity title if available
-                                    if 'opportunity_title' in opportunity_hours.columns and len(opportunity_hours) > 0:
-                                        opportunity_title = opportunity_hours['opportunity_title'].iloc[0]
-                                    else:
-                                        opportunity_title = f"Opportunity {opportunity_id}"
-                                    
-                                    participation_data.append({
-                                        'opportunity_id': opportunity_id,
-                                        'opportunity_title': opportunity_title,
-                                        'volunteer_count': len(volunteers),
-                                        'total_hours': total_hours,
-                                        'average_hours_per_volunteer': avg_hours
-                                    })
+                                participation_df = _cached_participation(data_key, st.session_state.data_service)
                                 
-                                if participation_data:
-                                    participation_df = pd.DataFrame(participation_data)
-                                    
+                                if not participation_df.empty:
                                     # Create participation chart
-                                    participation_chart = create_opportunity_participation_chart(
+                                    participation_chart = _cached_chart(data_key, "opportunity_participation", lambda: create_opportunity_participation_chart(
                                         participation_df,
                                         title="Opportunity Participation Analysis"
-                                    )
+                                    ))
                                     st.plotly_chart(participation_chart, use_container_width=True)
                                 else:
                                     st.info("No participation data available for chart.")
@@ -713,9 +844,10 @@ def main():
         with tab4:
             st.header("Engagement Analysis")
             
-            if hasattr(st.session_state.data_service, 'volunteer_df') and st.session_state.data_service.volunteer_df is not None:
+            if st.session_state.data_service.volunteer_df is not None:
                 try:
-                    engagement_metrics = st.session_state.data_service.get_volunteer_engagement_metrics()
+                    data_key = _data_key(st.session_state.data_service)
+                    engagement_metrics = _cached_engagement_metrics(data_key, st.session_state.data_service)
                     
                     # Display summary metrics in columns
                     col1, col2, col3 = st.columns(3)
@@ -745,11 +877,11 @@ def main():
                     # Check if engagement_score column exists
                     if 'engagement_score' in st.session_state.data_service.volunteer_df.columns:
                         # Create engagement distribution chart
-                        engagement_dist_chart = create_engagement_distribution_chart(
+                        engagement_dist_chart = _cached_chart(data_key, "engagement_distribution", lambda: create_engagement_distribution_chart(
                             st.session_state.data_service.volunteer_df,
                             engagement_column='engagement_score',
                             title="Volunteer Engagement Distribution"
-                        )
+                        ))
                         st.plotly_chart(engagement_dist_chart, use_container_width=True)
                         
                         # Engagement scatter plot
@@ -758,12 +890,12 @@ def main():
                         # Check if total_hours column exists
                         if 'total_hours' in st.session_state.data_service.volunteer_df.columns:
                             # Create engagement scatter plot
-                            engagement_scatter = create_engagement_scatter_plot(
+                            engagement_scatter = _cached_chart(data_key, "engagement_scatter", lambda: create_engagement_scatter_plot(
                                 st.session_state.data_service.volunteer_df,
                                 x_column='total_hours',
                                 y_column='engagement_score',
                                 title="Volunteer Engagement vs. Hours"
-                            )
+                            ))
                             st.plotly_chart(engagement_scatter, use_container_width=True)
                         else:
                             st.info("Missing hours data for engagement scatter plot.")
@@ -1,14 +1,24 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from typing import List, Dict, Optional, Tuple, Any
 
+try:
+    import orjson
+except ImportError:  # optional speedup; Plotly falls back to the stdlib encoder
+    orjson = None
+
+# st.plotly_chart serializes every figure with plotly.io.to_json; orjson
+# encodes the NumPy-backed trace arrays directly instead of via lists
+if orjson is not None:
+    pio.json.config.default_engine = 'orjson'
+
 
 def create_hours_histogram(df: pd.DataFrame, hours_column: str = 'total_hours', 
-                          bins: int = 15, title: str = "Hours Distribution") -> plt.Figure:
+                          bins: int = 15, title: str = "Hours Distribution") -> go.Figure:
     """
     Create a histogram of volunteer hours.
     
@@ -19,21 +29,28 @@ def create_hours_histogram(df: pd.DataFrame, hours_column: str = 'total_hours',
         title: Chart title
         
     Returns:
-        Matplotlib figure
+        Plotly figure
     """
-    fig, ax = plt.subplots(figsize=(8, 4))
-    ax.hist(df[hours_column], bins=bins, alpha=0.7, color='steelblue')
-    ax.set_xlabel("Hours")
-    ax.set_ylabel("Number of Volunteers")
-    ax.set_title(title)
-    ax.grid(axis='y', alpha=0.3)
-    plt.tight_layout()
+    fig = px.histogram(
+        df,
+        x=hours_column,
+        nbins=bins,
+        title=title,
+        color_discrete_sequence=['steelblue'],
+        opacity=0.7
+    )
+    
+    fig.update_layout(
+        xaxis_title="Hours",
+        yaxis_title="Number of Volunteers",
+        bargap=0.05
+    )
     
     return fig
 
 
 def create_hours_by_month_chart(hours_by_month: Dict[str, float], 
-                               title: str = "Hours by Month") -> plt.Figure:
+                               title: str = "Hours by Month") -> go.Figure:
     """
     Create a line chart of hours by month.
     
@@ -42,31 +59,34 @@ def create_hours_by_month_chart(hours_by_month: Dict[str, float],
         title: Chart title
         
     Returns:
-        Matplotlib figure
+        Plotly figure
     """
     # Convert dictionary to DataFrame
     df = pd.DataFrame(list(hours_by_month.items()), columns=['Month', 'Hours'])
     df['Month'] = pd.to_datetime(df['Month'])
     df = df.sort_values('Month')
     
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.plot(df['Month'], df['Hours'], marker='o', linestyle='-', color='forestgreen')
-    ax.set_xlabel("Month")
-    ax.set_ylabel("Hours")
-    ax.set_title(title)
-    ax.grid(alpha=0.3)
+    fig = px.line(
+        df,
+        x='Month',
+        y='Hours',
+        title=title,
+        markers=True,
+        color_discrete_sequence=['forestgreen']
+    )
     
     # Format x-axis as month-year
-    plt.xticks(rotation=45)
-    ax.xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter('%b %Y'))
-    
-    plt.tight_layout()
+    fig.update_xaxes(tickformat='%b %Y', tickangle=45)
+    fig.update_layout(
+        xaxis_title="Month",
+        yaxis_title="Hours"
+    )
     
     return fig
 
 
 def create_top_volunteers_chart(top_volunteers: Dict[str, float], 
-                               title: str = "Top Volunteers by Hours") -> plt.Figure:
+                               title: str = "Top Volunteers by Hours") -> go.Figure:
     """
     Create a bar chart of top volunteers by hours.
     
@@ -75,26 +95,32 @@ def create_top_volunteers_chart(top_volunteers: Dict[str, float],
         title: Chart title
         
     Returns:
-        Matplotlib figure
+        Plotly figure
     """
     # Convert dictionary to DataFrame
     df = pd.DataFrame(list(top_volunteers.items()), columns=['Volunteer', 'Hours'])
     df = df.sort_values('Hours', ascending=True)
     
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.barh(df['Volunteer'], df['Hours'], color='steelblue', alpha=0.7)
-    ax.set_xlabel("Hours")
-    ax.set_ylabel("Volunteer")
-    ax.set_title(title)
-    ax.grid(axis='x', alpha=0.3)
+    fig = px.bar(
+        df,
+        x='Hours',
+        y='Volunteer',
+        orientation='h',
+        title=title,
+        color_discrete_sequence=['steelblue'],
+        opacity=0.7
+    )
     
-    plt.tight_layout()
+    fig.update_layout(
+        xaxis_title="Hours",
+        yaxis_title="Volunteer"
+    )
     
     return fig
 
 
 def create_top_opportunities_chart(top_opportunities: Dict[str, float], 
-                                  title: str = "Top Opportunities by Hours") -> plt.Figure:
+                                  title: str = "Top Opportunities by Hours") -> go.Figure:
     """
     Create a bar chart of top opportunities by hours.
     
@@ -103,20 +129,26 @@ def create_top_opportunities_chart(top_opportunities: Dict[str, float],
         title: Chart title
         
     Returns:
-        Matplotlib figure
+        Plotly figure
     """
     # Convert dictionary to DataFrame
     df = pd.DataFrame(list(top_opportunities.items()), columns=['Opportunity', 'Hours'])
     df = df.sort_values('Hours', ascending=True)
     
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.barh(df['Opportunity'], df['Hours'], color='darkorange', alpha=0.7)
-    ax.set_xlabel("Hours")
-    ax.set_ylabel("Opportunity")
-    ax.set_title(title)
-    ax.grid(axis='x', alpha=0.3)
+    fig = px.bar(
+        df,
+        x='Hours',
+        y='Opportunity',
+        orientation='h',
+        title=title,
+        color_discrete_sequence=['darkorange'],
+        opacity=0.7
+    )
     
-    plt.tight_layout()
+    fig.update_layout(
+        xaxis_title="Hours",
+        yaxis_title="Opportunity"
+    )
     
     return fig
 
@@ -128,6 +160,9 @@ def create_engagement_scatter_plot(df: pd.DataFrame, x_column: str = 'total_hour
     """
     Create a scatter plot of volunteer engagement.
     
+    Points are drawn with WebGL (Scattergl) so thousands of volunteers
+    don't slow the browser down the way SVG markers do.
+    
     Args:
         df: DataFrame with volunteer data
         x_column: Column for x-axis
@@ -143,6 +178,7 @@ def create_engagement_scatter_plot(df: pd.DataFrame, x_column: str = 'total_hour
             df, x=x_column, y=y_column, color=color_column,
             hover_name="name" if "name" in df.columns else None,
             title=title,
+            render_mode="webgl",
             labels={
                 x_column: x_column.replace('_', ' ').title(),
                 y_column: y_column.replace('_', ' ').title(),
@@ -154,6 +190,7 @@ def create_engagement_scatter_plot(df: pd.DataFrame, x_column: str = 'total_hour
             df, x=x_column, y=y_column,
             hover_name="name" if "name" in df.columns else None,
             title=title,
+            render_mode="webgl",
             labels={
                 x_column: x_column.replace('_', ' ').title(),
                 y_column: y_column.replace('_', ' ').title()
@@ -183,25 +220,12 @@ def create_engagement_distribution_chart(df: pd.DataFrame,
     Returns:
         Plotly figure
     """
-    # Define engagement categories
-    df['engagement_category'] = pd.cut(
-        df[engagement_column],
-        bins=[0, 30, 60, 100],
-        labels=['Low', 'Medium', 'High']
-    )
-    
-    # Count volunteers in each category
-    category_counts = df['engagement_category'].value_counts().reset_index()
-    category_counts.columns = ['Category', 'Count']
-    
-    # Sort by engagement level
+    # Bin scores into (0, 30], (30, 60] and (60, 100] with one pass over the
+    # raw array; index 0 catches scores <= 0 and 4 catches > 100 or NaN
     category_order = ['Low', 'Medium', 'High']
-    category_counts['Category'] = pd.Categorical(
-        category_counts['Category'], 
-        categories=category_order, 
-        ordered=True
-    )
-    category_counts = category_counts.sort_values('Category')
+    bin_index = np.searchsorted([0, 30, 60, 100], df[engagement_column].to_numpy(dtype=float), side='left')
+    counts = np.bincount(bin_index, minlength=5)[1:4]
+    category_counts = pd.DataFrame({'Category': category_order, 'Count': counts})
     
     # Create color map
     colors = {'Low': 'red', 'Medium': 'orange', 'High': 'green'}
@@ -241,33 +265,23 @@ def create_hours_cumulative_chart(df: pd.DataFrame, hours_column: str = 'total_h
     Returns:
         Plotly figure
     """
-    # Sort hours
-    hours = sorted(df[hours_column].tolist())
+    # Sort hours once; NaN sorts last and is never counted
+    hours = np.sort(df[hours_column].to_numpy(dtype=float))
     
     if max_hours is None:
-        max_hours = int(max(hours)) + 1
-    
-    # Create cumulative data
-    cumulative_data = []
-    
-    for h in range(0, max_hours + 1):
-        count = len([x for x in hours if x <= h])
-        percentage = count / len(hours) * 100 if len(hours) > 0 else 0
-        
-        cumulative_data.append({
-            'Hours': h,
-            'Volunteers': count,
-            'Percentage': percentage
-        })
+        max_hours = int(np.nanmax(hours)) + 1 if len(hours) > 0 else 0
     
-    cumulative_df = pd.DataFrame(cumulative_data)
+    # Count volunteers at or below each whole hour with a binary search per step
+    hour_axis = np.arange(0, max_hours + 1)
+    counts = np.searchsorted(hours, hour_axis, side='right')
+    percentages = counts * (100.0 / len(hours)) if len(hours) > 0 else np.zeros(len(hour_axis))
     
     # Create figure
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
-        x=cumulative_df['Hours'],
-        y=cumulative_df['Percentage'],
+        x=hour_axis,
+        y=percentages,
         mode='lines+markers',
         name='Cumulative %',
         line=dict(color='forestgreen', width=2),
@@ -304,6 +318,7 @@ def create_opportunity_participation_chart(df: pd.DataFrame,
         size="average_hours_per_volunteer",
         hover_name="opportunity_title",
         title=title,
+        render_mode="webgl",
         labels={
             "volunteer_count": "Number of Volunteers",
             "total_hours": "Total Hours",
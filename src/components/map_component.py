@@ -1,10 +1,29 @@
 import folium
 from folium.plugins import HeatMap
 import streamlit as st
-from streamlit_folium import folium_static, st_folium
+from streamlit_folium import st_folium
 import pandas as pd
-import geopandas as gpd
-from typing import List, Dict, Optional, Tuple, Any
+import numpy as np
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple, Any
+
+if TYPE_CHECKING:
+    # Only needed for annotations; geopandas pulls in shapely and fiona at import time
+    import geopandas as gpd
+
+from utils.tile_pyramid import aggregate_points
+
+# Above this many points the heatmap is built from per-tile aggregates
+HEATMAP_AGGREGATE_THRESHOLD = 5000
+# How many zoom levels finer than the initial view the heatmap bins are
+HEATMAP_DETAIL_ZOOMS = 5
+# Above this many dots, nearby volunteers are merged into one dot per map tile
+DOT_AGGREGATE_THRESHOLD = 2000
+# Dot tiles are coarser than heatmap bins: about 32px across at the initial view
+DOT_DETAIL_ZOOMS = 3
+# Color for points without a color_by value
+DEFAULT_MARKER_COLOR = '#3186cc'
+# Blue-to-red marker colors indexed by a value quantized to 0-255
+COLOR_LUT = np.array([f'#{i:02x}00{255 - i:02x}' for i in range(256)], dtype=object)
 
 
 def create_map(df: pd.DataFrame, center: Optional[List[float]] = None, 
@@ -32,11 +51,12 @@ def create_map(df: pd.DataFrame, center: Optional[List[float]] = None,
     """
     # Filter out rows with missing coordinates
     if 'latitude' in df.columns and 'longitude' in df.columns:
-        # Filter out zip code-only addresses if requested
+        # One mask for missing coordinates and, if requested, zip code-only addresses;
+        # nothing below mutates df_valid, so the filtered view needs no copy
+        valid_mask = df['latitude'].notna() & df['longitude'].notna()
         if exclude_zip_only and 'is_zip_only' in df.columns:
-            df = df[~df['is_zip_only']].copy()
-            
-        df_valid = df.dropna(subset=['latitude', 'longitude']).copy()
+            valid_mask &= ~df['is_zip_only']
+        df_valid = df[valid_mask]
         
         if len(df_valid) == 0:
             # No valid coordinates, create empty map with default center
@@ -57,103 +77,158 @@ def create_map(df: pd.DataFrame, center: Optional[List[float]] = None,
     
     # Add individual markers or circles based on preference
     if (show_dots or show_markers) and len(df_valid) > 0:
-        # Determine color scale if color_by is provided
-        color_scale = None
-        if color_by and color_by in df_valid.columns:
-            # Normalize values to 0-1 range for coloring
-            min_val = df_valid[color_by].min()
-            max_val = df_valid[color_by].max()
-            
-            if min_val != max_val:
-                df_valid['color_value'] = (df_valid[color_by] - min_val) / (max_val - min_val)
-                
-                # Function to convert normalized value to color
-                def get_color(val):
-                    # Simple blue to red scale
-                    if pd.isna(val):
-                        return '#3186cc'  # Default blue for missing values
-                    
-                    # Convert value to color on blue-red scale
-                    r = int(255 * val)
-                    b = int(255 * (1 - val))
-                    return f'#{r:02x}00{b:02x}'
-                
-                df_valid['marker_color'] = df_valid['color_value'].apply(get_color)
-            else:
-                # All values are the same, use default color
-                df_valid['marker_color'] = '#3186cc'
+        if show_dots and not show_markers and len(df_valid) > DOT_AGGREGATE_THRESHOLD:
+            # Too many individual dots for the browser; draw one dot per occupied tile instead
+            _add_aggregated_dots(m, df_valid, zoom_start + DOT_DETAIL_ZOOMS, marker_size, color_by)
         else:
-            # No color column, use default color
-            df_valid['marker_color'] = '#3186cc'
-        
-        # Add markers for each point
-        for idx, row in df_valid.iterrows():
-            # Skip if coordinates are missing
-            if pd.isna(row['latitude']) or pd.isna(row['longitude']):
-                continue
-                
-            # Create popup with available information
-            popup_html = "<div style='width: 200px'>"
+            # Color each point by color_by if provided, otherwise use the default color
+            if color_by and color_by in df_valid.columns:
+                values = df_valid[color_by].to_numpy(dtype=float)
+                marker_colors = _scale_colors(values, values)
+            else:
+                marker_colors = np.full(len(df_valid), DEFAULT_MARKER_COLOR, dtype=object)
+            
+            # Build every popup with column-wise string operations instead of per-row Series access
+            popups = pd.Series("<div style='width: 200px'>", index=df_valid.index)
             
             # Add name if available
-            if 'name' in row and not pd.isna(row['name']):
-                popup_html += f"<h4>{row['name']}</h4>"
+            if 'name' in df_valid.columns:
+                popups += ("<h4>" + df_valid['name'].astype(str) + "</h4>").where(df_valid['name'].notna(), "")
             
             # Add other metrics if available
             metrics = ['total_hours', 'engagement_score', 'address', 'city', 'state']
             for metric in metrics:
-                if metric in row and not pd.isna(row[metric]):
-                    popup_html += f"<b>{metric.replace('_', ' ').title()}:</b> {row[metric]}<br>"
+                if metric in df_valid.columns:
+                    label = f"<b>{metric.replace('_', ' ').title()}:</b> "
+                    popups += (label + df_valid[metric].astype(str) + "<br>").where(df_valid[metric].notna(), "")
             
-            popup_html += "</div>"
+            popups += "</div>"
             
-            if show_markers:
-                folium.Marker(
-                    location=[row['latitude'], row['longitude']],
-                    popup=folium.Popup(popup_html, max_width=300),
-                    icon=folium.Icon(color=row['marker_color'], icon='info-sign')
-                ).add_to(m)
-            elif show_dots:
-                folium.CircleMarker(
-                    location=[row['latitude'], row['longitude']],
-                    radius=marker_size,
-                    popup=folium.Popup(popup_html, max_width=300),
-                    color=row['marker_color'],
-                    fill=True,
-                    fill_color=row['marker_color'],
-                    fill_opacity=0.7
-                ).add_to(m)
+            # Add markers for each point (df_valid already has no missing coordinates)
+            for lat, lng, color, popup_html in zip(df_valid['latitude'].to_numpy(), df_valid['longitude'].to_numpy(),
+                                                   marker_colors, popups.to_numpy()):
+                if show_markers:
+                    folium.Marker(
+                        location=[lat, lng],
+                        popup=folium.Popup(popup_html, max_width=300),
+                        icon=folium.Icon(color=color, icon='info-sign')
+                    ).add_to(m)
+                elif show_dots:
+                    folium.CircleMarker(
+                        location=[lat, lng],
+                        radius=marker_size,
+                        popup=folium.Popup(popup_html, max_width=300),
+                        color=color,
+                        fill=True,
+                        fill_color=color,
+                        fill_opacity=0.7
+                    ).add_to(m)
     
     # Add heatmap if requested
     if heatmap and len(df_valid) > 0:
         # If color_by is provided, use it for heatmap intensity
-        if color_by and color_by in df_valid.columns:
-            heat_data = [[row['latitude'], row['longitude'], row[color_by]] 
-                         for idx, row in df_valid.iterrows() 
-                         if pd.notna(row['latitude']) and pd.notna(row['longitude']) and pd.notna(row[color_by])]
-        else:
-            heat_data = [[row['latitude'], row['longitude']] 
-                         for idx, row in df_valid.iterrows()
-                         if pd.notna(row['latitude']) and pd.notna(row['longitude'])]
+        columns = ['latitude', 'longitude'] + ([color_by] if color_by and color_by in df_valid.columns else [])
+        
+        # Slice the columns once and stay in NumPy until the final list handed to folium;
+        # coordinates are already valid, so only a weight column can still hold NaN
+        points = df_valid[columns].to_numpy(dtype=float)
+        if points.shape[1] > 2:
+            points = points[~np.isnan(points[:, 2])]
+        
+        # Large datasets: collapse points into fine tiles so the browser only gets one point per occupied tile
+        if len(points) > HEATMAP_AGGREGATE_THRESHOLD:
+            weights = points[:, 2] if points.shape[1] > 2 else None
+            points = np.column_stack(aggregate_points(points[:, 0], points[:, 1],
+                                                      zoom_start + HEATMAP_DETAIL_ZOOMS, weights))
         
-        if heat_data:  # Only add heatmap if we have data
-            HeatMap(heat_data, radius=radius, blur=10, gradient={0.4: 'blue', 0.65: 'lime', 1: 'red'}).add_to(m)
+        if len(points) > 0:  # Only add heatmap if we have data
+            HeatMap(points.tolist(), radius=radius, blur=10, gradient={0.4: 'blue', 0.65: 'lime', 1: 'red'}).add_to(m)
     
     return m
 
 
-def display_map(m: folium.Map, height: int = 600) -> Dict:
+def _scale_colors(values: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """
+    Map values onto the blue-to-red scale spanned by the reference values.
+    
+    Args:
+        values: Values to color; NaN gets the default color
+        reference: Values whose min and max define the ends of the scale
+        
+    Returns:
+        Array of hex color strings, one per value
+    """
+    colors = np.full(len(values), DEFAULT_MARKER_COLOR, dtype=object)
+    if np.isnan(reference).all():
+        return colors
+    
+    min_val, max_val = np.nanmin(reference), np.nanmax(reference)
+    if min_val == max_val:
+        # All values are the same, use default color
+        return colors
+    
+    # Quantize to 0-255 in one pass and look the colors up, instead of formatting a hex string per row
+    present = ~np.isnan(values)
+    scaled = (values[present] - min_val) / (max_val - min_val) * 255
+    colors[present] = COLOR_LUT[np.clip(scaled, 0, 255).astype(np.uint8)]
+    return colors
+
+
+def _add_aggregated_dots(m: folium.Map, df: pd.DataFrame, zoom: int, marker_size: int,
+                         color_by: Optional[str] = None) -> None:
+    """
+    Add one dot per occupied map tile, sized by the number of volunteers in it.
+    
+    Args:
+        m: Folium map to add the dots to
+        df: DataFrame with latitude and longitude columns and no missing coordinates
+        zoom: Tile zoom level to bin at
+        marker_size: Size of a dot representing a single volunteer
+        color_by: Column whose per-tile mean sets the dot color
+    """
+    lats, lngs, counts = aggregate_points(df['latitude'], df['longitude'], zoom)
+    
+    if color_by and color_by in df.columns:
+        values = df[color_by].to_numpy(dtype=float)
+        present = ~np.isnan(values)
+        _, _, sums = aggregate_points(df['latitude'], df['longitude'], zoom, np.where(present, values, 0))
+        _, _, present_counts = aggregate_points(df['latitude'], df['longitude'], zoom, present)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(present_counts > 0, sums / present_counts, np.nan)
+        colors = _scale_colors(means, values)
+    else:
+        colors = np.full(len(counts), DEFAULT_MARKER_COLOR, dtype=object)
+    
+    # Area grows with the count, capped so dense tiles don't swallow the map
+    radii = np.minimum(marker_size * np.sqrt(counts), marker_size * 8)
+    
+    for lat, lng, count, radius, color in zip(lats, lngs, counts, radii, colors):
+        folium.CircleMarker(
+            location=[lat, lng],
+            radius=float(radius),
+            popup=folium.Popup(f"{int(count)} volunteer{'s' if count != 1 else ''}", max_width=300),
+            color=color,
+            fill=True,
+            fill_color=color,
+            fill_opacity=0.7
+        ).add_to(m)
+
+
+def display_map(m: folium.Map, height: int = 600,
+                returned_objects: Optional[List[str]] = None) -> Dict:
     """
     Display a Folium map in Streamlit and return click data.
     
     Args:
         m: Folium map to display
         height: Height of the map in pixels
+        returned_objects: Interaction keys to send back to the app; only
+            changes to these trigger a rerun (all keys when None)
         
     Returns:
         Dictionary with map interaction data
     """
-    return st_folium(m, width="100%", height=height)
+    return st_folium(m, width="100%", height=height, returned_objects=returned_objects)
 
 
 def add_reference_marker(m: folium.Map, lat: float, lng: float, 
@@ -179,7 +254,7 @@ def add_reference_marker(m: folium.Map, lat: float, lng: float,
     return m
 
 
-def create_choropleth_map(gdf: gpd.GeoDataFrame, value_column: str, 
+def create_choropleth_map(gdf: 'gpd.GeoDataFrame', value_column: str, 
                          title: str, center: Optional[List[float]] = None,
                          zoom_start: int = 11) -> folium.Map:
     """
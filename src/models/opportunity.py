@@ -1,9 +1,11 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Any
 from datetime import datetime
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
+from pydantic import TypeAdapter
 
 
-class Opportunity(BaseModel):
+@dataclass(slots=True)
+class Opportunity:
     """Model representing a volunteer opportunity."""
     id: str
     title: str
@@ -19,20 +21,26 @@ class Opportunity(BaseModel):
     category: Optional[str] = None
     organization: Optional[str] = None
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Opportunity":
+        """
+        Create an opportunity from raw data, validating and coercing each field.
+        
+        Args:
+            data: Field values keyed by name
+            
+        Returns:
+            Opportunity
+            
+        Raises:
+            pydantic.ValidationError: If a field is missing or has the wrong type
+        """
+        return _OPPORTUNITY_ADAPTER.validate_python(data)
+    
     @property
     def full_address(self) -> str:
         """Return the opportunity's full address."""
-        components = []
-        if self.address:
-            components.append(self.address)
-        if self.city:
-            components.append(self.city)
-        if self.state:
-            components.append(self.state)
-        if self.zip_code:
-            components.append(self.zip_code)
-        
-        return ", ".join(components) if components else ""
+        return ", ".join(filter(None, (self.address, self.city, self.state, self.zip_code)))
     
     @property
     def duration_hours(self) -> Optional[float]:
@@ -65,10 +73,39 @@ class Opportunity(BaseModel):
         return False
 
 
-class OpportunityParticipation(BaseModel):
+def filter_by_status(opportunities: List[Opportunity], status: str,
+                     now: Optional[datetime] = None) -> List[Opportunity]:
+    """
+    Select the opportunities that are past, upcoming or ongoing.
+    
+    Matches the is_past, is_upcoming and is_ongoing properties, but compares
+    every opportunity against one timestamp instead of reading the clock
+    once per object.
+    
+    Args:
+        opportunities: Opportunities to filter
+        status: "past", "upcoming" or "ongoing"
+        now: Time to compare against (defaults to the current time)
+        
+    Returns:
+        Opportunities with the requested status, in their original order
+    """
+    now = now or datetime.now()
+    
+    if status == "past":
+        return [o for o in opportunities if o.end_date and o.end_date < now]
+    if status == "upcoming":
+        return [o for o in opportunities if o.start_date and o.start_date > now]
+    if status == "ongoing":
+        return [o for o in opportunities if o.start_date and o.end_date and o.start_date <= now <= o.end_date]
+    raise ValueError(f"Unknown opportunity status: {status}")
+
+
+@dataclass(slots=True)
+class OpportunityParticipation:
     """Model representing participation in an opportunity."""
     opportunity_id: str
-    volunteer_ids: List[str] = Field(default_factory=list)
+    volunteer_ids: List[str] = field(default_factory=list)
     total_hours: float = 0
     average_hours_per_volunteer: float = 0
     
@@ -84,4 +121,8 @@ class OpportunityParticipation(BaseModel):
         if self.volunteer_ids:
             self.average_hours_per_volunteer = self.total_hours / len(self.volunteer_ids)
         else:
-            self.average_hours_per_volunteer = 0 
\ No newline at end of file
+            self.average_hours_per_volunteer = 0 
+
+
+# Validator for the from_dict boundary, built once at import
+_OPPORTUNITY_ADAPTER = TypeAdapter(Opportunity)
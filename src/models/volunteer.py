@@ -1,10 +1,31 @@
-from typing import List, Optional, Dict
+import bisect
+from typing import List, Optional, Dict, Tuple, Any
 from datetime import datetime, timedelta
-from pydantic import BaseModel, Field
+import numpy as np
+import pandas as pd
+from pydantic import TypeAdapter
 from dataclasses import dataclass, field
 
 
-class VolunteerHours(BaseModel):
+def _wall_clock(date: datetime) -> datetime:
+    """Drop any timezone, keeping the wall-clock time (replace() is slow, so skip it when naive)."""
+    return date if date.tzinfo is None else date.replace(tzinfo=None)
+
+
+def _to_datetime64(dates: List[datetime]) -> np.ndarray:
+    """
+    Convert naive datetimes to a datetime64[ns] array.
+    
+    NumPy converts each datetime in Python, pandas in C after a fixed setup
+    cost; pandas is faster from about 20 dates up.
+    """
+    if len(dates) < 20:
+        return np.array(dates, dtype='datetime64[ns]')
+    return pd.DatetimeIndex(dates).to_numpy().astype('datetime64[ns]')
+
+
+@dataclass(slots=True)
+class VolunteerHours:
     """Model representing volunteer hours logged."""
     id: str
     volunteer_id: str
@@ -14,14 +35,83 @@ class VolunteerHours(BaseModel):
     notes: Optional[str] = None
     status: str = "approved"
     
+    # (date, formatted string) from the last formatted_date call
+    _formatted_date: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    
     @property
     def formatted_date(self) -> str:
         """Return the date formatted as YYYY-MM-DD."""
-        return self.date.strftime("%Y-%m-%d")
+        # datetimes are immutable, so the cached string is valid while the
+        # same date object is assigned
+        if self._formatted_date is None or self._formatted_date[0] is not self.date:
+            self._formatted_date = (self.date, self.date.strftime("%Y-%m-%d"))
+        return self._formatted_date[1]
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VolunteerHours":
+        """
+        Create hours from raw data, validating and coercing each field.
+        
+        Args:
+            data: Field values keyed by name
+            
+        Returns:
+            VolunteerHours
+            
+        Raises:
+            pydantic.ValidationError: If a field is missing or has the wrong type
+        """
+        return _HOURS_ADAPTER.validate_python(data)
 
 
-class Volunteer(BaseModel):
-    """Model representing a volunteer."""
+class _HoursList(list):
+    """
+    List of VolunteerHours that carries the aggregates derived from it.
+    
+    Every method that adds, removes, replaces or reorders entries drops the
+    cached values, so reads between mutations reuse them without rescanning
+    the entries. Editing an entry in place is not a list mutation; call
+    Volunteer.invalidate_hours_cache() after doing so.
+    """
+    __slots__ = ('_columns', '_prefix', '_total')
+    
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.invalidate()
+    
+    def invalidate(self):
+        """Drop the cached columns, prefix sums and total."""
+        self._columns = None
+        self._prefix = None
+        self._total = None
+
+
+def _invalidating(name):
+    """Wrap list method `name` so it clears the cache before running."""
+    method = getattr(list, name)
+    
+    def wrapper(self, *args, **kwargs):
+        self.invalidate()
+        return method(self, *args, **kwargs)
+    
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(_HoursList, _name, _invalidating(_name))
+del _name
+
+
+@dataclass(slots=True)
+class Volunteer:
+    """
+    Model representing a volunteer.
+    
+    A plain slotted dataclass so that constructing and holding many
+    volunteers stays cheap; use from_dict where untrusted data enters.
+    """
     id: str
     first_name: str
     last_name: str
@@ -33,11 +123,34 @@ class Volunteer(BaseModel):
     zip_code: Optional[str] = None
     join_date: Optional[datetime] = None
     status: str = "active"
-    hours: List[VolunteerHours] = Field(default_factory=list)
+    hours: List[VolunteerHours] = field(default_factory=_HoursList)
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     is_zip_only: Optional[bool] = None
     
+    def __post_init__(self):
+        """Hold hours in an _HoursList, including lists validated by from_dict."""
+        self._hours_list()
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Volunteer":
+        """
+        Create a volunteer from raw data, validating and coercing each field.
+        
+        Entries in data['hours'] may be dicts, which are validated into
+        VolunteerHours in the same pass.
+        
+        Args:
+            data: Field values keyed by name
+            
+        Returns:
+            Volunteer
+            
+        Raises:
+            pydantic.ValidationError: If a field is missing or has the wrong type
+        """
+        return _VOLUNTEER_ADAPTER.validate_python(data)
+    
     @property
     def full_name(self) -> str:
         """Return the volunteer's full name."""
@@ -46,53 +159,87 @@ class Volunteer(BaseModel):
     @property
     def full_address(self) -> str:
         """Return the volunteer's full address."""
-        components = []
-        if self.address:
-            components.append(self.address)
-        if self.city:
-            components.append(self.city)
-        if self.state:
-            components.append(self.state)
-        if self.zip_code:
-            components.append(self.zip_code)
+        return ", ".join(filter(None, (self.address, self.city, self.state, self.zip_code)))
+    
+    def _hours_list(self) -> _HoursList:
+        """Return `hours`, first wrapping a plain list assigned to it in an _HoursList."""
+        if not isinstance(self.hours, _HoursList):
+            self.hours = _HoursList(self.hours)
+        return self.hours
+    
+    def invalidate_hours_cache(self):
+        """Drop values derived from `hours`; call after editing an entry in place."""
+        self._hours_list().invalidate()
+    
+    def hours_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the logged hours as parallel arrays.
+        
+        The arrays are extracted from the VolunteerHours objects once and
+        cached on the hours list until it is mutated or
+        invalidate_hours_cache() is called.
         
-        return ", ".join(components) if components else ""
+        Returns:
+            Tuple of (dates as datetime64[ns] in each entry's wall-clock time,
+            hours as float64, opportunity IDs as object)
+        """
+        hours = self._hours_list()
+        if hours._columns is None:
+            hours._columns = (
+                _to_datetime64([_wall_clock(hour.date) for hour in hours]),
+                np.array([hour.hours for hour in hours], dtype=np.float64),
+                np.array([hour.opportunity_id for hour in hours], dtype=object)
+            )
+        return hours._columns
     
     @property
     def total_hours(self) -> float:
         """Calculate total hours logged by the volunteer."""
-        return sum(hour.hours for hour in self.hours)
+        hours = self._hours_list()
+        if hours._total is None:
+            hours._total = float(sum(hour.hours for hour in hours))
+        return hours._total
     
     def hours_by_opportunity(self) -> Dict[str, float]:
         """Group hours by opportunity ID."""
-        result = {}
-        for hour in self.hours:
-            if hour.opportunity_id not in result:
-                result[hour.opportunity_id] = 0
-            result[hour.opportunity_id] += hour.hours
-        return result
+        _, hours, opportunity_ids = self.hours_columns()
+        return pd.Series(hours).groupby(opportunity_ids, sort=False).sum().to_dict()
     
     def hours_by_month(self) -> Dict[str, float]:
         """Group hours by month."""
-        result = {}
-        for hour in self.hours:
-            month_key = hour.date.strftime("%Y-%m")
-            if month_key not in result:
-                result[month_key] = 0
-            result[month_key] += hour.hours
-        return result
+        dates, hours, _ = self.hours_columns()
+        months, inverse = np.unique(dates.astype('datetime64[M]'), return_inverse=True)
+        totals = np.bincount(inverse, weights=hours, minlength=len(months))
+        return dict(zip(np.datetime_as_string(months, unit='M').tolist(), totals.tolist()))
     
     def hours_in_date_range(self, start_date: datetime, end_date: datetime) -> float:
-        """Calculate hours within a date range."""
-        return sum(hour.hours for hour in self.hours 
-                  if start_date <= hour.date <= end_date)
+        """
+        Calculate hours within a date range (compared in wall-clock time).
+        
+        Dates are sorted and hours prefix-summed once and cached alongside
+        hours_columns(), so each query is two binary searches. The sorted
+        view is kept as Python lists so bisect compares datetimes directly
+        instead of converting every query to datetime64.
+        """
+        hours_list = self._hours_list()
+        if hours_list._prefix is None:
+            dates, hours, _ = self.hours_columns()
+            order = np.argsort(dates, kind='stable')
+            hours_list._prefix = (dates[order].astype('datetime64[us]').tolist(),
+                                  np.concatenate([[0.0], np.cumsum(hours[order])]).tolist())
+        sorted_dates, cumulative_hours = hours_list._prefix
+        
+        start = bisect.bisect_left(sorted_dates, _wall_clock(start_date))
+        end = bisect.bisect_right(sorted_dates, _wall_clock(end_date))
+        return cumulative_hours[end] - cumulative_hours[start] if end > start else 0.0
     
-    def is_long_term(self, min_months: int = 6) -> bool:
+    def is_long_term(self, min_months: int = 6, now: Optional[datetime] = None) -> bool:
         """
         Determine if volunteer is long-term (active for at least min_months).
         
         Args:
             min_months: Minimum number of months to be considered long-term
+            now: Time to measure from (defaults to the current time)
             
         Returns:
             True if volunteer is long-term, False otherwise
@@ -100,12 +247,13 @@ class Volunteer(BaseModel):
         if not self.join_date:
             return False
             
-        months_active = (datetime.now() - self.join_date).days // 30
+        months_active = ((now or datetime.now()) - self.join_date).days // 30
         return months_active >= min_months
     
     def engagement_score(self, recency_weight: float = 0.4, 
                         frequency_weight: float = 0.3,
-                        hours_weight: float = 0.3) -> float:
+                        hours_weight: float = 0.3,
+                        now: Optional[datetime] = None) -> float:
         """
         Calculate an engagement score for the volunteer.
         
@@ -118,30 +266,37 @@ class Volunteer(BaseModel):
             recency_weight: Weight for recency component
             frequency_weight: Weight for frequency component
             hours_weight: Weight for hours component
+            now: Time to measure recency from (defaults to the current time);
+                pass one value when scoring many volunteers
             
         Returns:
             Engagement score from 0-100
         """
         if not self.hours:
             return 0
-            
+        
+        dates, hours, _ = self.hours_columns()
+        now = np.datetime64(now or datetime.now(), 'us')
+        
         # Recency: days since last volunteer activity (inverse)
-        latest_date = max(hour.date for hour in self.hours)
-        days_since = (datetime.now() - latest_date).days
+        days_since = int((now - dates.max()) // np.timedelta64(1, 'D'))
         recency_score = max(0, 100 - min(days_since, 100))
         
         # Frequency: number of distinct days volunteered in last 90 days
-        ninety_days_ago = datetime.now() - timedelta(days=90)
-        recent_days = set(hour.date.date() for hour in self.hours 
-                         if hour.date >= ninety_days_ago)
-        frequency_score = min(100, len(recent_days) * (100/30))  # Scale to 100
+        recent = dates >= now - np.timedelta64(90, 'D')
+        recent_days = len(np.unique(dates[recent].astype('datetime64[D]')))
+        frequency_score = min(100, recent_days * (100/30))  # Scale to 100
         
         # Hours: total hours in last 90 days (capped at 100)
-        recent_hours = sum(hour.hours for hour in self.hours 
-                          if hour.date >= ninety_days_ago)
+        recent_hours = float(hours[recent].sum())
         hours_score = min(100, recent_hours * 5)  # 20 hours = 100 score
         
         # Weighted score
         return (recency_weight * recency_score +
                 frequency_weight * frequency_score +
-                hours_weight * hours_score) 
\ No newline at end of file
+                hours_weight * hours_score) 
+
+
+# Validators for the from_dict boundaries, built once at import
+_HOURS_ADAPTER = TypeAdapter(VolunteerHours)
+_VOLUNTEER_ADAPTER = TypeAdapter(Volunteer)
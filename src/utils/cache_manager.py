@@ -3,9 +3,89 @@ import json
 import time
 import logging
 import hashlib
-from typing import Dict, Any, Optional
+import functools
+import threading
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # optional; entries are stored as plain JSON without it
+    zstandard = None
+
+# Frame magic that marks a zstd-compressed cache entry
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+# Marks the one-line header (timestamp and ttl) that precedes the entry body,
+# so expiry can be decided without reading or decompressing the body
+_HEADER_MAGIC = b'#cache '
+# Temp files older than this are orphans of an interrupted write, not one in flight
+STALE_TMP_SECONDS = 60
+
+def _json_default(obj: Any) -> Any:
+    """Encode NumPy arrays and scalars for the stdlib JSON fallback."""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _endpoint_prefix(endpoint: str) -> str:
+    """Filename-safe prefix shared by every cache entry for an endpoint."""
+    return endpoint.replace('/', '.') + '-'
+
+
+def _build_cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """
+    Serialize and hash an API request into a cache key.
+    
+    Args:
+        endpoint: API endpoint
+        params: Request parameters
+        
+    Returns:
+        Cache key string
+    """
+    # Create a string representation of the request
+    # Sort the params to ensure consistent key generation
+    param_parts = []
+    
+    # Convert all values to strings to ensure consistent serialization
+    for key in sorted(params.keys()):
+        if params[key] is None:
+            value = "null"
+        elif isinstance(params[key], bool):
+            value = "true" if params[key] else "false"
+        else:
+            value = str(params[key])
+        param_parts.append(f"{key}={value}")
+    
+    # Join with the ASCII unit separator rather than json.dumps, which
+    # cost more than the hash itself for typical small param dicts
+    param_str = "\x1f".join(param_parts)
+    key_str = f"{endpoint}:{param_str}"
+    
+    # Create a hash of the string for the filename, prefixed with the
+    # endpoint so all entries for one endpoint can be found by name;
+    # 128-bit BLAKE2b keeps the filename length of the old MD5 digest
+    digest = hashlib.blake2b(key_str.encode(), digest_size=16).hexdigest()
+    hash_value = f"{_endpoint_prefix(endpoint)}{digest}"
+    
+    # Log the key generation for debugging
+    logging.debug(f"Cache key for {endpoint}: {hash_value} (params: {param_str})")
+    
+    return hash_value
+
+
+@functools.lru_cache(maxsize=4096)
+def _memoized_cache_key(endpoint: str, param_items: Tuple[Tuple[str, type, Any], ...]) -> str:
+    """_build_cache_key for hashable (name, type, value) param triples."""
+    return _build_cache_key(endpoint, {key: value for key, _, value in param_items})
+
+
 class CacheManager:
     """
     Manages caching of API responses to reduce API calls and handle rate limiting.
@@ -33,6 +113,9 @@ class CacheManager:
         """
         Generate a unique cache key for an API request.
         
+        Keys are memoized per process, so paging or retrying the same request
+        skips re-serializing and re-hashing its params.
+        
         Args:
             endpoint: API endpoint
             params: Request parameters
@@ -40,30 +123,25 @@ class CacheManager:
         Returns:
             Cache key string
         """
-        # Create a string representation of the request
-        # Sort the params to ensure consistent key generation
-        sorted_params = {}
-        
-        # Convert all values to strings to ensure consistent serialization
-        for key in sorted(params.keys()):
-            if params[key] is None:
-                sorted_params[key] = "null"
-            elif isinstance(params[key], bool):
-                sorted_params[key] = "true" if params[key] else "false"
-            else:
-                sorted_params[key] = str(params[key])
-        
-        # Create a deterministic JSON string
-        param_str = json.dumps(sorted_params, sort_keys=True)
-        key_str = f"{endpoint}:{param_str}"
-        
-        # Create a hash of the string for the filename
-        hash_value = hashlib.md5(key_str.encode()).hexdigest()
-        
-        # Log the key generation for debugging
-        logging.debug(f"Cache key for {endpoint}: {hash_value} (params: {param_str})")
+        # Include each value's type: True == 1 and 1 == 1.0 as lookup keys,
+        # but they serialize differently
+        try:
+            return _memoized_cache_key(endpoint, tuple((key, type(value), value) for key, value in params.items()))
+        except TypeError:
+            # Unhashable param values (e.g. lists); build the key directly
+            return _build_cache_key(endpoint, params)
+    
+    def get_endpoint_prefix(self, endpoint: str) -> str:
+        """
+        Get the filename prefix shared by every cache entry for an endpoint.
         
-        return hash_value
+        Args:
+            endpoint: API endpoint
+            
+        Returns:
+            Filename-safe prefix
+        """
+        return _endpoint_prefix(endpoint)
     
     def get_cache_path(self, cache_key: str) -> str:
         """
@@ -77,7 +155,9 @@ class CacheManager:
         """
         return os.path.join(self.cache_dir, f"{cache_key}.json")
     
-    def save_to_cache(self, endpoint: str, params: Dict[str, Any], data: Any) -> None:
+    def save_to_cache(self, endpoint: str, params: Dict[str, Any], data: Any,
+                      ttl: Optional[int] = None, etag: Optional[str] = None,
+                      tombstone: bool = False, cache_key: Optional[str] = None) -> None:
         """
         Save API response data to cache.
         
@@ -85,69 +165,234 @@ class CacheManager:
             endpoint: API endpoint
             params: Request parameters
             data: Response data to cache
+            ttl: Lifetime of this entry in seconds (None to use max_age_days)
+            etag: ETag returned with the response, used for revalidation
+            tombstone: Whether this entry records a not-found (404) response
+            cache_key: Precomputed key from get_cache_key, to skip re-hashing params
         """
-        cache_key = self.get_cache_key(endpoint, params)
+        cache_key = cache_key or self.get_cache_key(endpoint, params)
         cache_path = self.get_cache_path(cache_key)
         
         cache_data = {
             "endpoint": endpoint,
             "params": params,
             "data": data,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat(),
+            "ttl": ttl,
+            "etag": etag,
+            "tombstone": tombstone
         }
         
         try:
-            with open(cache_path, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            self._write_entry(cache_path, cache_data)
             logging.debug(f"Saved data to cache: {cache_path}")
         except Exception as e:
             logging.error(f"Error saving to cache: {str(e)}")
     
-    def load_from_cache(self, endpoint: str, params: Dict[str, Any]) -> Optional[Any]:
+    def _write_entry(self, cache_path: str, cache_data: Dict[str, Any]) -> None:
         """
-        Load API response data from cache if available and not expired.
+        Serialize a cache entry and atomically replace the file at cache_path.
+        
+        The entry is written to a temporary file first and moved into place,
+        so a crash mid-write never leaves a truncated entry behind. Entries
+        are zstd-compressed when zstandard is installed; the filename keeps
+        its .json suffix and readers detect compression from the frame magic.
+        A plain header line with the timestamp and ttl comes first so
+        load_from_cache can check expiry without touching the body.
+        
+        Args:
+            cache_path: Destination file path
+            cache_data: Cache entry to write
+        """
+        # NumPy arrays and scalars are written natively as JSON numbers and lists
+        if orjson is not None:
+            blob = orjson.dumps(cache_data, option=orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            blob = json.dumps(cache_data, separators=(',', ':'), default=_json_default).encode()
+        if zstandard is not None:
+            blob = zstandard.ZstdCompressor(level=3).compress(blob)
+        header = json.dumps({"timestamp": cache_data["timestamp"], "ttl": cache_data.get("ttl")})
+        
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(_HEADER_MAGIC + header.encode() + b'\n')
+                f.write(blob)
+            # Stamp the file with the entry's own timestamp so directory scans
+            # (clear_cache, get_cache_stats) agree with the header exactly
+            written_at = datetime.fromisoformat(cache_data["timestamp"]).timestamp()
+            os.utime(tmp_path, (written_at, written_at))
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def _decode_body(self, blob: bytes) -> Dict[str, Any]:
+        """
+        Decode the body of a cache entry (zstd-compressed or plain JSON).
+        
+        Args:
+            blob: Entry bytes following the header line, if any
+            
+        Returns:
+            Cache entry
+        """
+        if blob.startswith(_ZSTD_MAGIC):
+            if zstandard is None:
+                raise RuntimeError("cache entry is zstd-compressed but zstandard is not installed")
+            blob = zstandard.ZstdDecompressor().decompress(blob)
+        return orjson.loads(blob) if orjson is not None else json.loads(blob)
+    
+    def _read_entry(self, cache_path: str) -> Dict[str, Any]:
+        """
+        Read a cache entry written by _write_entry (or an older plain JSON file).
+        
+        Args:
+            cache_path: Cache file path
+            
+        Returns:
+            Cache entry
+        """
+        with open(cache_path, 'rb') as f:
+            blob = f.read()
+        if blob.startswith(_HEADER_MAGIC):
+            blob = blob[blob.index(b'\n') + 1:]
+        return self._decode_body(blob)
+    
+    def load_cache_entry(self, endpoint: str, params: Dict[str, Any],
+                         cache_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Load the raw cache entry for a request, regardless of its age.
         
         Args:
             endpoint: API endpoint
             params: Request parameters
+            cache_key: Precomputed key from get_cache_key, to skip re-hashing params
             
         Returns:
-            Cached data or None if not available or expired
+            Cache entry (data, timestamp, ttl, etag) or None if not available
         """
-        cache_key = self.get_cache_key(endpoint, params)
+        cache_key = cache_key or self.get_cache_key(endpoint, params)
         cache_path = self.get_cache_path(cache_key)
         
-        # Add detailed logging
-        logging.info(f"Attempting to load from cache: {endpoint} (key: {cache_key})")
-        
         # Check if cache file exists
         if not os.path.exists(cache_path):
             logging.info(f"Cache miss: {endpoint} - File does not exist: {cache_path}")
             return None
         
         try:
-            with open(cache_path, 'r') as f:
-                cache_data = json.load(f)
+            return self._read_entry(cache_path)
+        except Exception as e:
+            logging.error(f"Error loading from cache: {str(e)}")
+            return None
+    
+    def is_fresh(self, cache_data: Dict[str, Any]) -> bool:
+        """
+        Check whether a cache entry is still within its lifetime.
+        
+        Args:
+            cache_data: Cache entry as returned by load_cache_entry
             
-            # Check if cache is expired
-            timestamp = datetime.fromisoformat(cache_data["timestamp"])
-            age = datetime.now() - timestamp
+        Returns:
+            True if the entry has not expired
+        """
+        timestamp = datetime.fromisoformat(cache_data["timestamp"])
+        ttl = cache_data.get("ttl")
+        max_age = timedelta(seconds=ttl) if ttl is not None else timedelta(days=self.max_age_days)
+        return datetime.now() - timestamp <= max_age
+    
+    def load_from_cache(self, endpoint: str, params: Dict[str, Any]) -> Optional[Any]:
+        """
+        Load API response data from cache if available and not expired.
+        
+        Args:
+            endpoint: API endpoint
+            params: Request parameters
             
-            if age > timedelta(days=self.max_age_days):
-                logging.info(f"Cache expired: {endpoint} (age: {age.days} days, {age.seconds // 3600} hours) - max age: {self.max_age_days} days")
+        Returns:
+            Cached data or None if not available or expired
+        """
+        # Add detailed logging
+        logging.info(f"Attempting to load from cache: {endpoint}")
+        
+        cache_path = self.get_cache_path(self.get_cache_key(endpoint, params))
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                # Reject expired entries from the header line before reading the body
+                line = f.readline(256)
+                if line.startswith(_HEADER_MAGIC):
+                    header = json.loads(line[len(_HEADER_MAGIC):])
+                    if not self.is_fresh(header):
+                        age = datetime.now() - datetime.fromisoformat(header["timestamp"])
+                        logging.info(f"Cache expired: {endpoint} (age: {age.days} days, {age.seconds // 3600} hours)")
+                        return None
+                    blob = f.read()
+                else:
+                    header = None
+                    blob = line + f.read()
+            
+            cache_data = self._decode_body(blob)
+            
+            # Entries written without a header are checked once their body is read
+            if header is None and not self.is_fresh(cache_data):
+                age = datetime.now() - datetime.fromisoformat(cache_data["timestamp"])
+                logging.info(f"Cache expired: {endpoint} (age: {age.days} days, {age.seconds // 3600} hours)")
                 return None
             
+            age = datetime.now() - datetime.fromisoformat((header or cache_data)["timestamp"])
+            
+            if cache_data.get("tombstone"):
+                logging.info(f"Cache hit: {endpoint} (not found, age: {age.days} days, {age.seconds // 3600} hours)")
+                return []
+            
             logging.info(f"Cache hit: {endpoint} (age: {age.days} days, {age.seconds // 3600} hours)")
             return cache_data["data"]
             
+        except FileNotFoundError:
+            logging.info(f"Cache miss: {endpoint} - File does not exist: {cache_path}")
+            return None
         except Exception as e:
             logging.error(f"Error loading from cache: {str(e)}")
             return None
     
+    def invalidate(self, endpoint: str) -> int:
+        """
+        Remove every cache entry for an endpoint, whatever its params.
+        
+        Args:
+            endpoint: API endpoint whose entries should be dropped
+            
+        Returns:
+            Number of files removed
+        """
+        prefix = self.get_endpoint_prefix(endpoint)
+        count = 0
+        
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not (entry.name.startswith(prefix) and entry.name.endswith('.json')):
+                    continue
+                try:
+                    os.remove(entry.path)
+                    count += 1
+                except FileNotFoundError:
+                    pass
+        
+        if count:
+            logging.info(f"Invalidated {count} cache files for {endpoint}")
+        return count
+    
     def clear_cache(self, older_than_days: Optional[int] = None) -> int:
         """
         Clear cache files.
         
+        Entry age comes from the file modification time, which _write_entry
+        sets to the entry timestamp, so no file is opened. Temp files left
+        behind by interrupted writes are swept in the same pass once they
+        are too old to belong to a write still in progress.
+        
         Args:
             older_than_days: Only clear files older than this many days (None for all)
             
@@ -155,34 +400,31 @@ class CacheManager:
             Number of files cleared
         """
         count = 0
-        now = datetime.now()
+        now = time.time()
+        cutoff = now - older_than_days * 86400 if older_than_days is not None else None
         
-        for filename in os.listdir(self.cache_dir):
-            if not filename.endswith('.json'):
-                continue
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.tmp'):
+                    try:
+                        if entry.stat().st_mtime < now - STALE_TMP_SECONDS:
+                            os.remove(entry.path)
+                    except OSError:
+                        pass
+                    continue
+                if not entry.name.endswith('.json'):
+                    continue
                 
-            file_path = os.path.join(self.cache_dir, filename)
-            
-            # If older_than_days is specified, check file age
-            if older_than_days is not None:
                 try:
-                    with open(file_path, 'r') as f:
-                        cache_data = json.load(f)
-                    
-                    timestamp = datetime.fromisoformat(cache_data["timestamp"])
-                    age = now - timestamp
-                    
-                    if age <= timedelta(days=older_than_days):
+                    # If older_than_days is specified, check file age
+                    if cutoff is not None and entry.stat().st_mtime >= cutoff:
                         continue
-                except Exception:
-                    # If we can't read the file, assume it's corrupt and delete it
+                    os.remove(entry.path)
+                    count += 1
+                except FileNotFoundError:
                     pass
-            
-            try:
-                os.remove(file_path)
-                count += 1
-            except Exception as e:
-                logging.error(f"Error deleting cache file {file_path}: {str(e)}")
+                except Exception as e:
+                    logging.error(f"Error deleting cache file {entry.path}: {str(e)}")
         
         logging.info(f"Cleared {count} cache files")
         return count
@@ -191,41 +433,40 @@ class CacheManager:
         """
         Get statistics about the cache.
         
+        Sizes and timestamps come from a single directory scan; entries are
+        not read.
+        
         Returns:
             Dictionary with cache statistics
         """
         total_files = 0
         total_size = 0
-        oldest_timestamp = None
-        newest_timestamp = None
+        oldest_mtime = None
+        newest_mtime = None
         
-        for filename in os.listdir(self.cache_dir):
-            if not filename.endswith('.json'):
-                continue
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json'):
+                    continue
                 
-            file_path = os.path.join(self.cache_dir, filename)
-            total_files += 1
-            total_size += os.path.getsize(file_path)
-            
-            try:
-                with open(file_path, 'r') as f:
-                    cache_data = json.load(f)
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
                 
-                timestamp = datetime.fromisoformat(cache_data["timestamp"])
+                total_files += 1
+                total_size += stat.st_size
                 
-                if oldest_timestamp is None or timestamp < oldest_timestamp:
-                    oldest_timestamp = timestamp
+                if oldest_mtime is None or stat.st_mtime < oldest_mtime:
+                    oldest_mtime = stat.st_mtime
                 
-                if newest_timestamp is None or timestamp > newest_timestamp:
-                    newest_timestamp = timestamp
-            except Exception:
-                # Skip files we can't read
-                pass
+                if newest_mtime is None or stat.st_mtime > newest_mtime:
+                    newest_mtime = stat.st_mtime
         
         return {
             "total_files": total_files,
             "total_size_bytes": total_size,
             "total_size_mb": total_size / (1024 * 1024),
-            "oldest_timestamp": oldest_timestamp.isoformat() if oldest_timestamp else None,
-            "newest_timestamp": newest_timestamp.isoformat() if newest_timestamp else None
-        } 
\ No newline at end of file
+            "oldest_timestamp": datetime.fromtimestamp(oldest_mtime).isoformat() if oldest_mtime is not None else None,
+            "newest_timestamp": datetime.fromtimestamp(newest_mtime).isoformat() if newest_mtime is not None else None
+        }
@@ -0,0 +1,28 @@
+import os
+import functools
+from typing import Dict
+from dotenv import load_dotenv
+
+# Streamlit re-executes app.py on every rerun but imports modules only once,
+# so .env is parsed here rather than at the top of the script. Variables
+# already set in the real environment take precedence.
+load_dotenv(override=False)
+
+
+@functools.lru_cache(maxsize=1)
+def env_config() -> Dict[str, str]:
+    """
+    Get credentials and endpoints from the environment.
+
+    Read once per process; restart the app to pick up changes to .env.
+
+    Returns:
+        Dictionary with api_key, email, password, base_url and google_maps_api_key
+    """
+    return {
+        'api_key': os.getenv("GALAXY_API_KEY", ""),
+        'email': os.getenv("GALAXY_EMAIL", ""),
+        'password': os.getenv("GALAXY_PASSWORD", ""),
+        'base_url': os.getenv("GALAXY_BASE_URL", "https://api.galaxydigital.com/api"),
+        'google_maps_api_key': os.getenv("GOOGLE_MAPS_API_KEY", "")
+    }
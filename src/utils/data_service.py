@@ -1,17 +1,25 @@
 import os
 import json
 import logging
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Union, IO
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
-import geopandas as gpd
-from shapely.geometry import Point
 import time
+import itertools
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib parser
+    orjson = None
 
 from api.galaxy_digital import GalaxyDigitalAPI
 from models.volunteer import Volunteer, VolunteerHours
 from models.opportunity import Opportunity, OpportunityParticipation
 
+# Shared by every DataService in the process so no two loads ever get the same version
+_DATA_VERSIONS = itertools.count(1)
+
 
 class DataService:
     """
@@ -34,6 +42,8 @@ class DataService:
         self.volunteer_df: Optional[pd.DataFrame] = None
         self.opportunity_df: Optional[pd.DataFrame] = None
         self.hours_df: Optional[pd.DataFrame] = None
+        # Bumped whenever the DataFrames are rebuilt or patched; keys cached results
+        self.data_version = 0
         
         if not self.api_available:
             logging.warning("No API client provided. Only local data operations will be available.")
@@ -54,7 +64,7 @@ class DataService:
         try:
             # Check if we have a valid cache file first
             cache_available = False
-            if hasattr(self.api_client, 'cache_manager') and self.api_client.cache_manager:
+            if self.api_client.cache_manager:
                 cache_stats = self.api_client.get_cache_stats()
                 if cache_stats and cache_stats.get('total_files', 0) > 0:
                     logging.info(f"Found {cache_stats.get('total_files', 0)} cache files ({cache_stats.get('total_size_mb', 0):.2f} MB)")
@@ -185,39 +195,40 @@ class DataService:
                         if debug_mode and i < 5:  # Only log for the first few volunteers
                             logging.debug(f"Hour value: {hour_value} from raw value: {h_data.get('hour_hours', 'N/A')}")
                         
-                        hours.append(VolunteerHours(
-                            id=h_data.get('id', ''),
-                            volunteer_id=volunteer_id,
-                            opportunity_id=opportunity_id,
-                            hours=hour_value,
-                            date=hour_date,
-                            notes=h_data.get('hour_description', ''),
-                            status=h_data.get('hour_status', 'approved')
-                        ))
+                        hours.append({
+                            'id': h_data.get('id', ''),
+                            'volunteer_id': volunteer_id,
+                            'opportunity_id': opportunity_id,
+                            'hours': hour_value,
+                            'date': hour_date,
+                            'notes': h_data.get('hour_description', ''),
+                            'status': h_data.get('hour_status', 'approved')
+                        })
                     
-                    # Create Volunteer object
-                    volunteer = Volunteer(
-                        id=v_data['id'],
-                        first_name=v_data.get('user_fname', v_data.get('first_name', '')),
-                        last_name=v_data.get('user_lname', v_data.get('last_name', '')),
-                        email=v_data.get('user_email', v_data.get('email')),
-                        phone=v_data.get('user_phone', v_data.get('phone')),
-                        address=v_data.get('user_address', v_data.get('address')),
-                        city=v_data.get('user_city', v_data.get('city')),
-                        state=v_data.get('user_state', v_data.get('state')),
-                        zip_code=v_data.get('user_postal', v_data.get('zip_code')),
-                        join_date=datetime.fromisoformat(v_data.get('created_at', '').replace('Z', '+00:00')) 
-                                  if 'created_at' in v_data else None,
-                        status=v_data.get('user_status', v_data.get('status', 'active')),
-                        hours=hours
-                    )
+                    # Create Volunteer object, validating it and its hours in one pass
+                    volunteer = Volunteer.from_dict({
+                        'id': v_data['id'],
+                        'first_name': v_data.get('user_fname', v_data.get('first_name', '')),
+                        'last_name': v_data.get('user_lname', v_data.get('last_name', '')),
+                        'email': v_data.get('user_email', v_data.get('email')),
+                        'phone': v_data.get('user_phone', v_data.get('phone')),
+                        'address': v_data.get('user_address', v_data.get('address')),
+                        'city': v_data.get('user_city', v_data.get('city')),
+                        'state': v_data.get('user_state', v_data.get('state')),
+                        'zip_code': v_data.get('user_postal', v_data.get('zip_code')),
+                        'join_date': datetime.fromisoformat(v_data.get('created_at', '').replace('Z', '+00:00')) 
+                                     if 'created_at' in v_data else None,
+                        'status': v_data.get('user_status', v_data.get('status', 'active')),
+                        'hours': hours
+                    })
                     
                     # Log volunteer data for debugging
                     logging.debug(f"Created volunteer: {volunteer.id} - {volunteer.full_name} with {len(hours)} hours")
                     
                     # Log address information for debugging
-                    if volunteer.full_address:
-                        logging.debug(f"Volunteer {volunteer.id} address: {volunteer.full_address}")
+                    full_address = volunteer.full_address
+                    if full_address:
+                        logging.debug(f"Volunteer {volunteer.id} address: {full_address}")
                     else:
                         logging.debug(f"Volunteer {volunteer.id} has no address information")
                         # Log the raw data to help diagnose issues
@@ -266,20 +277,20 @@ class DataService:
                     # Process all opportunities at once
                     for o_data in opportunity_data:
                         try:
-                            opportunity = Opportunity(
-                                id=o_data['id'],
-                                title=o_data.get('title', ''),
-                                description=o_data.get('description', ''),
-                                address=o_data.get('address', ''),
-                                city=o_data.get('city', ''),
-                                state=o_data.get('state', ''),
-                                zip_code=o_data.get('zip_code', ''),
-                                start_date=datetime.fromisoformat(o_data.get('start_date', '').replace('Z', '+00:00')) 
-                                          if 'start_date' in o_data and o_data['start_date'] else None,
-                                end_date=datetime.fromisoformat(o_data.get('end_date', '').replace('Z', '+00:00')) 
-                                        if 'end_date' in o_data and o_data['end_date'] else None,
-                                status=o_data.get('status', 'active')
-                            )
+                            opportunity = Opportunity.from_dict({
+                                'id': o_data['id'],
+                                'title': o_data.get('title', ''),
+                                'description': o_data.get('description', ''),
+                                'address': o_data.get('address', ''),
+                                'city': o_data.get('city', ''),
+                                'state': o_data.get('state', ''),
+                                'zip_code': o_data.get('zip_code', ''),
+                                'start_date': datetime.fromisoformat(o_data.get('start_date', '').replace('Z', '+00:00')) 
+                                              if 'start_date' in o_data and o_data['start_date'] else None,
+                                'end_date': datetime.fromisoformat(o_data.get('end_date', '').replace('Z', '+00:00')) 
+                                            if 'end_date' in o_data and o_data['end_date'] else None,
+                                'status': o_data.get('status', 'active')
+                            })
                             self.opportunities.append(opportunity)
                         except Exception as opp_error:
                             logging.warning(f"Error processing opportunity {o_data.get('id')}: {str(opp_error)}")
@@ -311,24 +322,32 @@ class DataService:
             
             raise
     
-    def load_from_geojson(self, file_path: str):
+    def load_from_geojson(self, file_path: Union[str, IO]):
         """
         Load volunteer data from a GeoJSON file.
         
         Args:
-            file_path: Path to the GeoJSON file
+            file_path: Path to the GeoJSON file, or an open file object
+                (e.g. a Streamlit upload) to read it from directly
         """
         try:
-            logging.info(f"Loading data from GeoJSON file: {file_path}")
-            
-            # Check if file exists
-            if not os.path.exists(file_path):
-                logging.error(f"GeoJSON file not found: {file_path}")
-                raise FileNotFoundError(f"GeoJSON file not found: {file_path}")
+            if hasattr(file_path, 'read'):
+                logging.info(f"Loading data from GeoJSON upload: {getattr(file_path, 'name', 'file object')}")
+                file_path.seek(0)
+                raw = file_path.read()
+            else:
+                logging.info(f"Loading data from GeoJSON file: {file_path}")
+                
+                # Check if file exists
+                if not os.path.exists(file_path):
+                    logging.error(f"GeoJSON file not found: {file_path}")
+                    raise FileNotFoundError(f"GeoJSON file not found: {file_path}")
+                
+                # Read GeoJSON file
+                with open(file_path, 'rb') as f:
+                    raw = f.read()
             
-            # Read GeoJSON file
-            with open(file_path, 'r') as f:
-                geojson = json.load(f)
+            geojson = orjson.loads(raw) if orjson is not None else json.loads(raw)
             
             # Validate GeoJSON
             if 'type' not in geojson or geojson['type'] != 'FeatureCollection':
@@ -363,23 +382,23 @@ class DataService:
                         lng, lat = coords[0], coords[1]
                 
                 # Create volunteer object
-                volunteer = Volunteer(
-                    id=properties.get('id', ''),
-                    first_name=properties.get('name', '').split(' ')[0] if ' ' in properties.get('name', '') else properties.get('name', ''),
-                    last_name=' '.join(properties.get('name', '').split(' ')[1:]) if ' ' in properties.get('name', '') else '',
-                    email=properties.get('email', ''),
-                    phone=properties.get('phone', ''),
-                    address=properties.get('address', ''),
-                    city=properties.get('city', ''),
-                    state=properties.get('state', ''),
-                    zip_code=properties.get('zip_code', ''),
-                    join_date=datetime.fromisoformat(properties.get('join_date', datetime.now().isoformat())) 
-                              if 'join_date' in properties else datetime.now(),
-                    status='active',
-                    hours=[],
-                    latitude=lat,
-                    longitude=lng
-                )
+                volunteer = Volunteer.from_dict({
+                    'id': properties.get('id', ''),
+                    'first_name': properties.get('name', '').split(' ')[0] if ' ' in properties.get('name', '') else properties.get('name', ''),
+                    'last_name': ' '.join(properties.get('name', '').split(' ')[1:]) if ' ' in properties.get('name', '') else '',
+                    'email': properties.get('email', ''),
+                    'phone': properties.get('phone', ''),
+                    'address': properties.get('address', ''),
+                    'city': properties.get('city', ''),
+                    'state': properties.get('state', ''),
+                    'zip_code': properties.get('zip_code', ''),
+                    'join_date': datetime.fromisoformat(properties.get('join_date', datetime.now().isoformat())) 
+                                 if 'join_date' in properties else datetime.now(),
+                    'status': 'active',
+                    'hours': [],
+                    'latitude': lat,
+                    'longitude': lng
+                })
                 
                 # Add is_zip_only attribute if it exists in properties
                 if 'is_zip_only' in properties:
@@ -398,16 +417,16 @@ class DataService:
                     hours_data = properties['hours']
                     if isinstance(hours_data, list):
                         for h_data in hours_data:
-                            volunteer.hours.append(VolunteerHours(
-                                id=h_data.get('id', ''),
-                                volunteer_id=volunteer.id,
-                                opportunity_id=h_data.get('opportunity_id', ''),
-                                hours=float(h_data.get('hours', 0)),
-                                date=datetime.fromisoformat(h_data.get('date', datetime.now().isoformat()))
-                                      if 'date' in h_data else datetime.now(),
-                                notes=h_data.get('notes', ''),
-                                status='approved'
-                            ))
+                            volunteer.hours.append(VolunteerHours.from_dict({
+                                'id': h_data.get('id', ''),
+                                'volunteer_id': volunteer.id,
+                                'opportunity_id': h_data.get('opportunity_id', ''),
+                                'hours': float(h_data.get('hours', 0)),
+                                'date': datetime.fromisoformat(h_data.get('date', datetime.now().isoformat()))
+                                        if 'date' in h_data else datetime.now(),
+                                'notes': h_data.get('notes', ''),
+                                'status': 'approved'
+                            }))
                     elif isinstance(hours_data, (int, float)):
                         # If hours is just a number, create a single hours entry
                         volunteer.hours.append(VolunteerHours(
@@ -435,9 +454,9 @@ class DataService:
         """Create pandas DataFrames from the loaded data."""
         # Create volunteer DataFrame
         volunteer_data = []
-        for volunteer in self.volunteers:
-            total_hours = sum(h.hours for h in volunteer.hours)
-            engagement_score = self._calculate_engagement_score(volunteer)
+        engagement_scores = self._calculate_engagement_scores(self.volunteers)
+        for volunteer, engagement_score in zip(self.volunteers, engagement_scores):
+            total_hours = volunteer.total_hours
             
             volunteer_data.append({
                 'id': volunteer.id,
@@ -454,9 +473,9 @@ class DataService:
                 'status': volunteer.status,
                 'total_hours': total_hours,
                 'engagement_score': engagement_score,
-                'latitude': getattr(volunteer, 'latitude', None),
-                'longitude': getattr(volunteer, 'longitude', None),
-                'is_zip_only': getattr(volunteer, 'is_zip_only', False)
+                'latitude': volunteer.latitude,
+                'longitude': volunteer.longitude,
+                'is_zip_only': bool(volunteer.is_zip_only)
             })
         
         if not volunteer_data:
@@ -464,10 +483,15 @@ class DataService:
             self.volunteer_df = pd.DataFrame()
             self.hours_df = pd.DataFrame()
             self.opportunity_df = pd.DataFrame()
+            self.data_version = next(_DATA_VERSIONS)
             return
             
         self.volunteer_df = pd.DataFrame(volunteer_data)
         
+        # Measures only need float32; halves the bytes each filter/aggregate pass touches
+        for column in ('total_hours', 'engagement_score'):
+            self.volunteer_df[column] = pd.to_numeric(self.volunteer_df[column], downcast='float')
+        
         # Save volunteer data to GeoJSON after creating DataFrame
         # This ensures we save progress even if later steps fail
         try:
@@ -495,6 +519,11 @@ class DataService:
         
         if hours_data:
             self.hours_df = pd.DataFrame(hours_data)
+            
+            # Repeated string keys: categoricals let groupby/nunique work on integer codes
+            for column in ('opportunity_id', 'volunteer_id', 'opportunity_title', 'volunteer_name'):
+                self.hours_df[column] = self.hours_df[column].astype('category')
+            self.hours_df['hours'] = pd.to_numeric(self.hours_df['hours'], downcast='float')
         else:
             logging.warning("No hours data available to create DataFrame")
             self.hours_df = pd.DataFrame()
@@ -522,48 +551,121 @@ class DataService:
         else:
             logging.warning("No opportunity data available to create DataFrame")
             self.opportunity_df = pd.DataFrame()
+        
+        self.data_version = next(_DATA_VERSIONS)
     
-    def _calculate_engagement_score(self, volunteer: Volunteer) -> float:
+    def update_coordinates(self, geocoded: List[Dict[str, Any]]) -> int:
         """
-        Calculate an engagement score for a volunteer.
+        Apply geocoding results to the volunteers and volunteer DataFrame.
         
-        The score is based on:
-        - Total hours
-        - Frequency of volunteering
-        - Recency of volunteering
+        Only the coordinate columns change, so they are patched in place
+        instead of rebuilding every DataFrame with _create_dataframes().
+        volunteer_df is replaced by an updated copy and data_version is
+        bumped so cached maps and charts are rebuilt.
         
         Args:
-            volunteer: Volunteer object
+            geocoded: Results from batch_geocode, dicts with 'id', 'latitude',
+                'longitude' and optionally 'is_zip_only' keys
             
         Returns:
-            Engagement score (0-100)
+            Number of volunteers updated
         """
-        # If no hours, return 0
-        if not volunteer.hours:
+        volunteers_by_id = {}
+        for volunteer in self.volunteers:
+            # Keep the first volunteer per id
+            volunteers_by_id.setdefault(volunteer.id, volunteer)
+        
+        updates = []
+        for result in geocoded:
+            if not result:
+                continue
+            
+            volunteer = volunteers_by_id.get(result['id'])
+            if volunteer is None:
+                continue
+            
+            volunteer.latitude = result['latitude']
+            volunteer.longitude = result['longitude']
+            if 'is_zip_only' in result:
+                volunteer.is_zip_only = result['is_zip_only']
+            updates.append({
+                'id': volunteer.id,
+                'latitude': volunteer.latitude,
+                'longitude': volunteer.longitude,
+                'is_zip_only': bool(volunteer.is_zip_only)
+            })
+        
+        if not updates:
             return 0
         
-        # Calculate total hours (max 50 points)
-        total_hours = sum(h.hours for h in volunteer.hours)
-        hours_score = min(total_hours / 100 * 50, 50)
+        if self.volunteer_df is None or 'id' not in self.volunteer_df.columns:
+            self._create_dataframes()
+            return len(updates)
         
-        # Calculate frequency (max 25 points)
-        # Count unique dates
-        unique_dates = len(set(h.date.date() for h in volunteer.hours))
-        frequency_score = min(unique_dates / 10 * 25, 25)
+        coords = pd.DataFrame(updates).drop_duplicates('id', keep='last').set_index('id')
+        df = self.volunteer_df.copy()
+        matched = df['id'].isin(coords.index)
+        for column in ('latitude', 'longitude', 'is_zip_only'):
+            df.loc[matched, column] = df.loc[matched, 'id'].map(coords[column])
+        self.volunteer_df = df
+        self.data_version = next(_DATA_VERSIONS)
         
-        # Calculate recency (max 25 points)
-        # Get most recent volunteer date
-        if volunteer.hours:
-            most_recent = max(h.date for h in volunteer.hours)
-            days_since = (datetime.now() - most_recent).days
-            recency_score = max(0, 25 - (days_since / 30 * 5))  # Lose 5 points per month
-        else:
-            recency_score = 0
+        logging.info(f"Updated coordinates for {len(updates)} volunteers")
+        return len(updates)
+    
+    def _calculate_engagement_scores(self, volunteers: List[Volunteer]) -> List[float]:
+        """
+        Calculate engagement scores for many volunteers at once.
         
-        # Calculate total score
-        total_score = hours_score + frequency_score + recency_score
+        The score is based on:
+        - Total hours (max 50 points)
+        - Frequency of volunteering (max 25 points)
+        - Recency of volunteering (max 25 points)
         
-        return total_score
+        Every volunteer's hours are concatenated and scored with grouped
+        NumPy reductions instead of one Python call per volunteer; volunteers
+        with no hours score 0.
+        
+        Args:
+            volunteers: Volunteer objects
+            
+        Returns:
+            Engagement score (0-100) for each volunteer, in order
+        """
+        columns = [volunteer.hours_columns() for volunteer in volunteers]
+        counts = np.array([len(hours) for _, hours, _ in columns], dtype=np.int64)
+        scores = np.zeros(len(volunteers))
+        has_hours = counts > 0
+        if not has_hours.any():
+            return scores.tolist()
+        
+        # Flat layout: owner[i] is the volunteer that hours entry i belongs to
+        dates = np.concatenate([dates for dates, _, _ in columns]).astype(np.int64)
+        hours = np.concatenate([hours for _, hours, _ in columns])
+        owner = np.repeat(np.arange(len(volunteers)), counts)
+        
+        # Calculate total hours (max 50 points)
+        total_hours = np.bincount(owner, weights=hours, minlength=len(volunteers))
+        hours_score = np.minimum(total_hours / 100 * 50, 50)
+        
+        # Calculate frequency (max 25 points) from distinct (volunteer, day) pairs
+        day_ns = np.timedelta64(1, 'D').astype('timedelta64[ns]').astype(np.int64)
+        days = dates // day_ns
+        day_span = days.max() - days.min() + 1
+        volunteer_days = np.unique(owner * day_span + (days - days.min()))
+        unique_dates = np.bincount(volunteer_days // day_span, minlength=len(volunteers))
+        frequency_score = np.minimum(unique_dates / 10 * 25, 25)
+        
+        # Calculate recency (max 25 points); entries are grouped by owner, so
+        # each volunteer's latest date is a reduceat over its slice
+        starts = np.cumsum(counts) - counts
+        most_recent = np.maximum.reduceat(dates, starts[has_hours])
+        now = np.datetime64(datetime.now(), 'ns').astype(np.int64)
+        days_since = (now - most_recent) // day_ns
+        recency_score = np.maximum(0, 25 - (days_since / 30 * 5))  # Lose 5 points per month
+        
+        scores[has_hours] = hours_score[has_hours] + frequency_score[has_hours] + recency_score
+        return scores.tolist()
     
     def get_volunteer_geojson(self) -> Dict:
         """
@@ -577,14 +679,16 @@ class DataService:
         volunteers_without_coords = 0
         zip_code_only_count = 0
         
-        for volunteer in self.volunteers:
+        engagement_scores = self._calculate_engagement_scores(self.volunteers)
+        for volunteer, engagement_score in zip(self.volunteers, engagement_scores):
             # Get a proper name or use a placeholder
             full_name = volunteer.full_name.strip()
             if not full_name or full_name == ' ':
                 full_name = "Volunteer " + volunteer.id
                 
             # Log address information for debugging
-            logging.debug(f"Processing volunteer {volunteer.id} for GeoJSON with address: {volunteer.full_address}")
+            full_address = volunteer.full_address
+            logging.debug(f"Processing volunteer {volunteer.id} for GeoJSON with address: {full_address}")
             
             # Determine if this is a zip code only address
             is_zip_only = bool(volunteer.zip_code and not volunteer.address and not volunteer.city and not volunteer.state)
@@ -593,7 +697,7 @@ class DataService:
                 logging.debug(f"Volunteer {volunteer.id} has zip code only address: {volunteer.zip_code}")
             
             # Skip volunteers without address
-            if not volunteer.full_address:
+            if not full_address:
                 logging.debug(f"Volunteer {volunteer.id} has no full address, using minimal data")
                 # Instead of skipping, include with minimal data
                 feature = {
@@ -608,7 +712,7 @@ class DataService:
                         "state": volunteer.state if volunteer.state else "",
                         "zip_code": volunteer.zip_code if volunteer.zip_code else "",
                         "total_hours": volunteer.total_hours,
-                        "engagement_score": self._calculate_engagement_score(volunteer),
+                        "engagement_score": engagement_score,
                         "needs_geocoding": True,
                         "is_zip_only": is_zip_only
                     }
@@ -618,8 +722,8 @@ class DataService:
                 continue
                 
             # Use coordinates if available
-            lat = getattr(volunteer, 'latitude', None)
-            lng = getattr(volunteer, 'longitude', None)
+            lat = volunteer.latitude
+            lng = volunteer.longitude
             
             # Skip if no coordinates (can be geocoded later)
             if lat is None or lng is None or (lat == 0 and lng == 0):
@@ -633,12 +737,12 @@ class DataService:
                         "id": volunteer.id,
                         "name": full_name,
                         "email": volunteer.email,
-                        "address": volunteer.full_address,
+                        "address": full_address,
                         "city": volunteer.city if volunteer.city else "",
                         "state": volunteer.state if volunteer.state else "",
                         "zip_code": volunteer.zip_code if volunteer.zip_code else "",
                         "total_hours": volunteer.total_hours,
-                        "engagement_score": self._calculate_engagement_score(volunteer),
+                        "engagement_score": engagement_score,
                         "needs_geocoding": True,
                         "is_zip_only": is_zip_only
                     }
@@ -655,12 +759,12 @@ class DataService:
                         "id": volunteer.id,
                         "name": full_name,
                         "email": volunteer.email,
-                        "address": volunteer.full_address,
+                        "address": full_address,
                         "city": volunteer.city if volunteer.city else "",
                         "state": volunteer.state if volunteer.state else "",
                         "zip_code": volunteer.zip_code if volunteer.zip_code else "",
                         "total_hours": volunteer.total_hours,
-                        "engagement_score": self._calculate_engagement_score(volunteer),
+                        "engagement_score": engagement_score,
                         "needs_geocoding": False,
                         "is_zip_only": is_zip_only
                     }
@@ -734,11 +838,18 @@ class DataService:
         logging.info(f"GeoJSON contains {valid_geometries} features with valid geometry")
         
         try:
-            # Ensure the file is properly written
-            with open(file_path, 'w') as f:
-                json.dump(geojson, f, indent=2)
+            if orjson is not None:
+                payload = orjson.dumps(geojson, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+            else:
+                payload = json.dumps(geojson, indent=2).encode('utf-8')
+            
+            # Write to a temporary file and swap it in so readers never see a partial file
+            tmp_path = f"{file_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
                 f.flush()  # Ensure data is written to disk
                 os.fsync(f.fileno())  # Force write to physical storage
+            os.replace(tmp_path, file_path)
                 
             # Verify the file was written correctly
             if os.path.exists(file_path):
@@ -768,7 +879,8 @@ class DataService:
         
         for opportunity in self.opportunities:
             # Skip opportunities without address
-            if not opportunity.full_address:
+            full_address = opportunity.full_address
+            if not full_address:
                 continue
                 
             # Geocode address (in a real implementation, you would use a geocoding service)
@@ -784,7 +896,7 @@ class DataService:
                 "properties": {
                     "title": opportunity.title,
                     "description": opportunity.description,
-                    "address": opportunity.full_address,
+                    "address": full_address,
                     "start_date": opportunity.start_date.isoformat() if opportunity.start_date else None,
                     "end_date": opportunity.end_date.isoformat() if opportunity.end_date else None,
                     "category": opportunity.category,
@@ -837,7 +949,7 @@ class DataService:
             if 'volunteer_id' in self.hours_df.columns:
                 summary['total_volunteers'] = self.hours_df['volunteer_id'].nunique()
                 if 'hours' in self.hours_df.columns:
-                    summary['average_hours_per_volunteer'] = self.hours_df.groupby('volunteer_id')['hours'].sum().mean()
+                    summary['average_hours_per_volunteer'] = self.hours_df.groupby('volunteer_id', observed=True)['hours'].sum().mean()
                 else:
                     summary['average_hours_per_volunteer'] = 0
             else:
@@ -861,7 +973,7 @@ class DataService:
         try:
             summary = {
                 'total_hours': self.hours_df['hours'].sum(),
-                'average_hours_per_volunteer': self.hours_df.groupby('volunteer_id')['hours'].sum().mean(),
+                'average_hours_per_volunteer': self.hours_df.groupby('volunteer_id', observed=True)['hours'].sum().mean(),
                 'total_volunteers': self.hours_df['volunteer_id'].nunique(),
                 'total_opportunities': self.hours_df['opportunity_id'].nunique()
             }
@@ -877,8 +989,8 @@ class DataService:
             # in the sample data or might have different names
             if 'opportunity_title' in self.hours_df.columns:
                 try:
-                    summary['hours_by_opportunity'] = self.hours_df.groupby('opportunity_title')['hours'].sum().to_dict()
-                    summary['top_opportunities'] = self.hours_df.groupby('opportunity_title')['hours'].sum().nlargest(10).to_dict()
+                    summary['hours_by_opportunity'] = self.hours_df.groupby('opportunity_title', observed=True)['hours'].sum().to_dict()
+                    summary['top_opportunities'] = self.hours_df.groupby('opportunity_title', observed=True)['hours'].sum().nlargest(10).to_dict()
                 except Exception as e:
                     logging.warning(f"Error calculating opportunity statistics: {str(e)}")
                     summary['hours_by_opportunity'] = {}
@@ -889,7 +1001,7 @@ class DataService:
                 
             if 'volunteer_name' in self.hours_df.columns:
                 try:
-                    summary['top_volunteers'] = self.hours_df.groupby('volunteer_name')['hours'].sum().nlargest(10).to_dict()
+                    summary['top_volunteers'] = self.hours_df.groupby('volunteer_name', observed=True)['hours'].sum().nlargest(10).to_dict()
                 except Exception as e:
                     logging.warning(f"Error calculating top volunteers: {str(e)}")
                     summary['top_volunteers'] = {}
@@ -942,18 +1054,23 @@ class DataService:
                     'long_term_percentage': 0
                 }
                 
+            # Bucket every score in one pass: below 40, 40 up to 70, and 70 or more
+            scores = self.volunteer_df['engagement_score'].to_numpy(dtype=float)
+            scores = scores[~np.isnan(scores)]
+            low_count, medium_count, high_count = np.bincount(np.searchsorted([40, 70], scores, side='right'), minlength=3)
+            
             metrics = {
                 'average_engagement_score': self.volunteer_df['engagement_score'].mean(),
-                'high_engagement_count': len(self.volunteer_df[self.volunteer_df['engagement_score'] >= 70]),
-                'medium_engagement_count': len(self.volunteer_df[(self.volunteer_df['engagement_score'] >= 40) & 
-                                                              (self.volunteer_df['engagement_score'] < 70)]),
-                'low_engagement_count': len(self.volunteer_df[self.volunteer_df['engagement_score'] < 40])
+                'high_engagement_count': int(high_count),
+                'medium_engagement_count': int(medium_count),
+                'low_engagement_count': int(low_count)
             }
             
             # Check if is_long_term column exists
             if 'is_long_term' in self.volunteer_df.columns:
-                metrics['long_term_volunteer_count'] = len(self.volunteer_df[self.volunteer_df['is_long_term']])
-                metrics['long_term_percentage'] = len(self.volunteer_df[self.volunteer_df['is_long_term']]) / len(self.volunteer_df) * 100 if len(self.volunteer_df) > 0 else 0
+                long_term_count = int(self.volunteer_df['is_long_term'].sum())
+                metrics['long_term_volunteer_count'] = long_term_count
+                metrics['long_term_percentage'] = long_term_count / len(self.volunteer_df) * 100
             else:
                 metrics['long_term_volunteer_count'] = 0
                 metrics['long_term_percentage'] = 0
@@ -971,6 +1088,37 @@ class DataService:
                 'long_term_percentage': 0
             }
     
+    def get_opportunity_participation(self) -> pd.DataFrame:
+        """
+        Get per-opportunity participation from the hours data.
+        
+        Aggregates in a single groupby pass rather than filtering hours_df
+        once per opportunity.
+        
+        Returns:
+            DataFrame with opportunity_id, opportunity_title, volunteer_count,
+            total_hours and average_hours_per_volunteer columns
+        """
+        opportunity_ids = self.hours_df['opportunity_id']
+        hours_df = self.hours_df[opportunity_ids.notna() & (opportunity_ids != '')]  # Skip empty opportunity IDs
+        
+        aggregations = {
+            'total_hours': ('hours', 'sum'),
+            'volunteer_count': ('volunteer_id', 'nunique')
+        }
+        if 'opportunity_title' in hours_df.columns:
+            aggregations['opportunity_title'] = ('opportunity_title', 'first')
+        participation_df = (hours_df.groupby('opportunity_id', sort=False, observed=True)
+                            .agg(**aggregations)
+                            .reset_index())
+        if 'opportunity_title' not in participation_df.columns:
+            participation_df['opportunity_title'] = 'Opportunity ' + participation_df['opportunity_id'].astype(str)
+        participation_df['average_hours_per_volunteer'] = (
+            participation_df['total_hours'] / participation_df['volunteer_count']
+        ).where(participation_df['volunteer_count'] > 0, 0)
+        
+        return participation_df
+    
     def get_opportunity_participation_metrics(self) -> Dict[str, Any]:
         """
         Get participation metrics for opportunities.
@@ -1001,42 +1149,16 @@ class DataService:
                     'highest_hour_opportunities': []
                 }
                 
-            # Calculate participation for each opportunity
-            participation_data = []
-            
-            for opportunity_id in self.hours_df['opportunity_id'].unique():
-                if not opportunity_id:  # Skip empty opportunity IDs
-                    continue
-                    
-                opportunity_hours = self.hours_df[self.hours_df['opportunity_id'] == opportunity_id]
-                volunteers = opportunity_hours['volunteer_id'].unique()
-                total_hours = opportunity_hours['hours'].sum()
-                avg_hours = total_hours / len(volunteers) if len(volunteers) > 0 else 0
-                
-                # Get opportunity title if available
-                if 'opportunity_title' in opportunity_hours.columns and len(opportunity_hours) > 0:
-                    opportunity_title = opportunity_hours['opportunity_title'].iloc[0]
-                else:
-                    opportunity_title = f"Opportunity {opportunity_id}"
-                
-                participation_data.append({
-                    'opportunity_id': opportunity_id,
-                    'opportunity_title': opportunity_title,
-                    'volunteer_count': len(volunteers),
-                    'total_hours': total_hours,
-                    'average_hours_per_volunteer': avg_hours
-                })
+            participation_df = self.get_opportunity_participation()
             
             # If no participation data, return empty metrics
-            if not participation_data:
+            if participation_df.empty:
                 return {
                     'average_volunteers_per_opportunity': 0,
                     'average_hours_per_opportunity': 0,
                     'most_popular_opportunities': [],
                     'highest_hour_opportunities': []
                 }
-                
-            participation_df = pd.DataFrame(participation_data)
             
             metrics = {
                 'average_volunteers_per_opportunity': participation_df['volunteer_count'].mean(),
@@ -1071,6 +1193,7 @@ class DataService:
             
         fixed_count = 0
         for volunteer in self.volunteers:
+            fixed_before = fixed_count
             for hour in volunteer.hours:
                 if isinstance(hour.hours, str):
                     try:
@@ -1088,6 +1211,10 @@ class DataService:
                         # Set to 0 if we can't parse it
                         hour.hours = 0.0
                         fixed_count += 1
+            
+            # Entries were edited in place, which the hours list cannot see
+            if fixed_count > fixed_before:
+                volunteer.invalidate_hours_cache()
         
         # Recreate dataframes with the fixed hour values
         if fixed_count > 0:
@@ -0,0 +1,29 @@
+import numpy as np
+from typing import Union
+
+# Mean Earth radius in kilometers
+EARTH_RADIUS_KM = 6371.0
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def haversine_km(lat1: ArrayLike, lng1: ArrayLike, lat2: ArrayLike, lng2: ArrayLike) -> np.ndarray:
+    """
+    Great-circle distance between coordinates, vectorised over NumPy arrays.
+
+    Any argument may be a scalar or an array; arrays broadcast, so a whole
+    column of points can be measured against one reference point in a
+    single call.
+
+    Args:
+        lat1: Latitude(s) of the first point(s) in degrees
+        lng1: Longitude(s) of the first point(s) in degrees
+        lat2: Latitude(s) of the second point(s) in degrees
+        lng2: Longitude(s) of the second point(s) in degrees
+
+    Returns:
+        Distance(s) in kilometers
+    """
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
@@ -2,17 +2,18 @@ import re
 import time
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Tuple, Optional, Any
 import os
-from dotenv import load_dotenv
 import random
 import concurrent.futures
 import json
+import hashlib
+import threading
 from pathlib import Path
 import urllib.parse
 
-# Load environment variables
-load_dotenv()
+from utils.config import env_config
 
 # Create a geocoding cache directory if it doesn't exist
 CACHE_DIR = Path("geocode_cache")
@@ -21,6 +22,14 @@ CACHE_DIR.mkdir(exist_ok=True)
 # Global cache to avoid duplicate API calls within the same session
 ADDRESS_CACHE = {}
 
+# Geocoded coordinates rarely change; re-geocode entries older than this
+GEOCODE_CACHE_MAX_AGE_DAYS = 365
+
+# One pooled session for all Geocoding API calls, so parallel workers reuse
+# TLS connections instead of opening one per address
+GEOCODING_SESSION = requests.Session()
+GEOCODING_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
 def sanitize_address(address: str) -> str:
     """
     Clean up address string for geocoding.
@@ -74,6 +83,21 @@ def get_cache_key(address: str) -> str:
     normalized = re.sub(r'\s+', ' ', address.lower().strip())
     return normalized
 
+def get_cache_file(cache_key: str) -> Path:
+    """
+    Get the cache file path for a cache key.
+    
+    Uses a stable digest rather than hash(), which is salted per process and
+    would give every run a different file name.
+    
+    Args:
+        cache_key: Normalized cache key from get_cache_key
+        
+    Returns:
+        Path of the cache file
+    """
+    return CACHE_DIR / f"{hashlib.md5(cache_key.encode('utf-8')).hexdigest()}.json"
+
 def load_from_cache(address: str) -> Optional[Dict[str, float]]:
     """
     Try to load geocoding results from cache.
@@ -91,11 +115,15 @@ def load_from_cache(address: str) -> Optional[Dict[str, float]]:
         return ADDRESS_CACHE[cache_key]
     
     # Check file cache
-    cache_file = CACHE_DIR / f"{hash(cache_key)}.json"
+    cache_file = get_cache_file(cache_key)
     if cache_file.exists():
         try:
             with open(cache_file, 'r') as f:
                 data = json.load(f)
+                # Entries without a timestamp predate expiry and are kept
+                if time.time() - data.get('timestamp', time.time()) > GEOCODE_CACHE_MAX_AGE_DAYS * 86400:
+                    logging.debug(f"Cache entry expired: {address}")
+                    return None
                 # Handle both old and new format
                 if 'latitude' in data and 'longitude' in data:
                     result = {
@@ -133,18 +161,41 @@ def save_to_cache(address: str, coordinates: Dict[str, float]) -> None:
     # Save to memory cache
     ADDRESS_CACHE[cache_key] = coordinates
     
-    # Save to file cache
-    cache_file = CACHE_DIR / f"{hash(cache_key)}.json"
+    # Save to file cache, via a temporary file so concurrent workers never see a partial write
+    cache_file = get_cache_file(cache_key)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
     try:
-        with open(cache_file, 'w') as f:
+        with open(tmp_file, 'w') as f:
             json.dump({
                 'address': address,
                 'latitude': coordinates['latitude'],
-                'longitude': coordinates['longitude']
+                'longitude': coordinates['longitude'],
+                'timestamp': time.time()
             }, f)
+        os.replace(tmp_file, cache_file)
     except Exception as e:
         logging.warning(f"Error writing cache file for {address}: {str(e)}")
 
+def clear_geocode_cache() -> int:
+    """
+    Remove all cached geocoding results, in memory and on disk.
+    
+    Returns:
+        Number of cache files removed
+    """
+    ADDRESS_CACHE.clear()
+    
+    count = 0
+    for cache_file in CACHE_DIR.glob("*.json"):
+        try:
+            cache_file.unlink()
+            count += 1
+        except Exception as e:
+            logging.warning(f"Error removing geocoding cache file {cache_file}: {str(e)}")
+    
+    logging.info(f"Cleared {count} geocoding cache files")
+    return count
+
 def geocode_zip_code(zip_code: str, api_key: Optional[str] = None) -> Optional[Tuple[float, float]]:
     """
     Geocode a zip code to get coordinates, with a small random offset to distribute points.
@@ -157,7 +208,7 @@ def geocode_zip_code(zip_code: str, api_key: Optional[str] = None) -> Optional[T
         Tuple of (latitude, longitude) or None if geocoding failed
     """
     if not api_key:
-        api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+        api_key = env_config()['google_maps_api_key']
         
     if not api_key:
         logging.error("No Google Maps API key provided")
@@ -175,7 +226,7 @@ def geocode_zip_code(zip_code: str, api_key: Optional[str] = None) -> Optional[T
     url = f"https://maps.googleapis.com/maps/api/geocode/json?address={zip_code}&key={api_key}"
     
     try:
-        response = requests.get(url)
+        response = GEOCODING_SESSION.get(url, timeout=30)
         data = response.json()
         
         if data['status'] == 'OK' and data['results']:
@@ -209,7 +260,7 @@ def geocode_address(address: str, api_key: Optional[str] = None) -> Optional[Tup
         Tuple of (latitude, longitude) or None if geocoding failed
     """
     if not api_key:
-        api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+        api_key = env_config()['google_maps_api_key']
         
     if not api_key:
         logging.error("No Google Maps API key provided")
@@ -227,7 +278,7 @@ def geocode_address(address: str, api_key: Optional[str] = None) -> Optional[Tup
     url = f"https://maps.googleapis.com/maps/api/geocode/json?address={urllib.parse.quote(address)}&key={api_key}"
     
     try:
-        response = requests.get(url)
+        response = GEOCODING_SESSION.get(url, timeout=30)
         data = response.json()
         
         if data['status'] == 'OK' and data['results']:
@@ -334,11 +385,7 @@ def batch_geocode(addresses, api_key, exclude_zip_only=False, max_workers=10, pr
         return []
     
     # Create cache directory if it doesn't exist
-    cache_dir = Path("geocode_cache")
-    cache_dir.mkdir(exist_ok=True)
-    
-    # Determine the actual number of workers based on the number of addresses
-    actual_workers = min(max_workers, len(addresses))
+    CACHE_DIR.mkdir(exist_ok=True)
     
     # Initialize counters for progress reporting
     processed_count = 0
@@ -348,14 +395,46 @@ def batch_geocode(addresses, api_key, exclude_zip_only=False, max_workers=10, pr
     # Create a list to store the results
     results = []
     
-    logging.info(f"Geocoding {len(addresses)} addresses using {actual_workers} workers")
+    # Resolve previously geocoded addresses up front so only misses reach the thread pool
+    to_geocode = []
+    for address in addresses:
+        address_text = address.get('address') if address else None
+        cached_result = load_from_cache(address_text) if address_text else None
+        if not cached_result:
+            to_geocode.append(address)
+            continue
+        
+        is_zip_only = is_zip_code_only(address_text)
+        processed_count += 1
+        if exclude_zip_only and is_zip_only:
+            continue
+        results.append({
+            'id': address.get('id', 'unknown'),
+            'latitude': cached_result['latitude'],
+            'longitude': cached_result['longitude'],
+            'is_zip_only': is_zip_only
+        })
+        success_count += 1
+    
+    if processed_count:
+        logging.info(f"Found {success_count} of {total_count} addresses in the geocoding cache")
+        if progress_callback:
+            progress_callback(processed_count, total_count, success_count)
+    
+    if not to_geocode:
+        return results
+    
+    # Determine the actual number of workers based on the number of addresses left to geocode
+    actual_workers = min(max_workers, len(to_geocode))
+    
+    logging.info(f"Geocoding {len(to_geocode)} addresses using {actual_workers} workers")
     
     # Use ThreadPoolExecutor for parallel processing
     with concurrent.futures.ThreadPoolExecutor(max_workers=actual_workers) as executor:
         # Submit all geocoding tasks
         future_to_address = {
             executor.submit(geocode_address_worker, (address, api_key, exclude_zip_only)): address
-            for address in addresses
+            for address in to_geocode
         }
         
         # Process results as they complete
@@ -0,0 +1,81 @@
+import threading
+import time
+import logging
+
+
+class TokenBucket:
+    """
+    Adaptive token-bucket rate limiter for outgoing API requests.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``, so
+    calls only block once a burst has drained the bucket. The rate backs off
+    multiplicatively when the server signals throttling and recovers gradually
+    after a run of successful responses.
+    """
+
+    def __init__(self, rate: float = 10, capacity: float = 20, min_rate: float = 0.5,
+                 backoff: float = 0.7, recovery_step: float = 1.0, recovery_after: int = 20):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Steady-state requests per second (also the recovery ceiling)
+            capacity: Maximum number of tokens, i.e. the allowed burst size
+            min_rate: Lower bound the rate will never back off below
+            backoff: Factor applied to the rate on each throttled response
+            recovery_step: Requests per second added back after a run of successes
+            recovery_after: Number of consecutive successes before stepping the rate up
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.backoff = backoff
+        self.recovery_step = recovery_step
+        self.recovery_after = recovery_after
+
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """
+        Take one token, blocking only if the bucket is empty.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def throttled(self) -> None:
+        """
+        Record a rate-limited response and reduce the refill rate.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate * self.backoff)
+            self._successes = 0
+            logging.info(f"Rate limiter backing off to {self.rate:.2f} requests/second")
+
+    def succeeded(self) -> None:
+        """
+        Record a successful response, stepping the rate back toward its ceiling.
+        """
+        with self._lock:
+            if self.rate >= self.max_rate:
+                return
+            self._successes += 1
+            if self._successes >= self.recovery_after:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.recovery_step)
+                self._successes = 0
+                logging.debug(f"Rate limiter recovering to {self.rate:.2f} requests/second")
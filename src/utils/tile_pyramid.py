@@ -0,0 +1,62 @@
+import numpy as np
+from typing import Optional, Tuple
+
+# Web Mercator is undefined at the poles; clamp like slippy-map tile servers do
+MAX_LATITUDE = 85.05112878
+
+
+def lat_lng_to_tile(lats: np.ndarray, lngs: np.ndarray, zoom: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert coordinates to slippy-map tile indices at a zoom level.
+
+    Args:
+        lats: Array of latitudes in degrees
+        lngs: Array of longitudes in degrees
+        zoom: Tile zoom level
+
+    Returns:
+        Tuple of (x, y) integer tile index arrays
+    """
+    n = 2 ** zoom
+    lat_rad = np.radians(np.clip(lats, -MAX_LATITUDE, MAX_LATITUDE))
+    x = np.floor((np.asarray(lngs) + 180.0) / 360.0 * n)
+    y = np.floor((1.0 - np.arcsinh(np.tan(lat_rad)) / np.pi) / 2.0 * n)
+    return np.clip(x, 0, n - 1).astype(np.int64), np.clip(y, 0, n - 1).astype(np.int64)
+
+
+def aggregate_points(lats: np.ndarray, lngs: np.ndarray, zoom: int,
+                     weights: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Collapse points into one weighted point per tile at a zoom level.
+
+    Each occupied tile is represented by the mean position of the points that
+    fall in it, weighted by the summed point weights (or the point count when
+    no weights are given), so a heatmap built from the result keeps the same
+    overall shape with far fewer points.
+
+    Args:
+        lats: Array of latitudes in degrees
+        lngs: Array of longitudes in degrees
+        zoom: Tile zoom level to bin at
+        weights: Optional per-point weights
+
+    Returns:
+        Tuple of (lats, lngs, weights) arrays, one entry per occupied tile
+    """
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+    weights = np.ones(len(lats)) if weights is None else np.asarray(weights, dtype=float)
+
+    if len(lats) == 0:
+        return lats, lngs, weights
+
+    x, y = lat_lng_to_tile(lats, lngs, zoom)
+    tile_ids, inverse = np.unique(x * (2 ** zoom) + y, return_inverse=True)
+
+    counts = np.bincount(inverse, minlength=len(tile_ids))
+    tile_lats = np.bincount(inverse, weights=lats, minlength=len(tile_ids)) / counts
+    tile_lngs = np.bincount(inverse, weights=lngs, minlength=len(tile_ids)) / counts
+    tile_weights = np.bincount(inverse, weights=weights, minlength=len(tile_ids))
+
+    return tile_lats, tile_lngs, tile_weights
+
@@ -2,37 +2,38 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import json
+import shutil
 import folium
 from folium.plugins import HeatMap
-from streamlit_folium import folium_static
 import matplotlib.pyplot as plt
-from geopy.distance import geodesic
-import geopandas as gpd
-from shapely.geometry import Point
 from streamlit_folium import st_folium
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib parser
+    orjson = None
 
 st.set_page_config(page_title="Park Volunteer Analysis", layout="wide")
 
 def load_geojson(file_path="addresses.geojson"):
     """Load GeoJSON data and convert to DataFrame"""
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         
-        # Extract features into a list of dictionaries
-        features = []
-        for feature in data['features']:
-            lng, lat = feature['geometry']['coordinates']
-            properties = feature['properties']
-            features.append({
-                'name': properties['name'],
-                'email': properties['email'],
-                'address': properties['address'],
-                'latitude': lat,
-                'longitude': lng
-            })
+        # Extract features column by column rather than building a dict per row
+        features = data['features']
+        properties = [feature['properties'] for feature in features]
+        coordinates = np.array([feature['geometry']['coordinates'][:2] for feature in features],
+                               dtype=float).reshape(-1, 2)
         
-        return pd.DataFrame(features)
+        return pd.DataFrame({
+            'name': [p['name'] for p in properties],
+            'email': [p['email'] for p in properties],
+            'address': [p['address'] for p in properties],
+            'latitude': coordinates[:, 1],
+            'longitude': coordinates[:, 0]
+        })
     except Exception as e:
         st.error(f"Error loading GeoJSON file: {str(e)}")
         return None
@@ -47,18 +48,22 @@ def create_map(df, center=None, heatmap=False, radius=10, show_markers=False, sh
     
     # Add individual markers or circles based on preference
     if show_dots or show_markers:
-        for idx, row in df.iterrows():
+        # Build all popups with column-wise string operations rather than one f-string per row
+        popups = ("<b>" + df['name'].fillna('').astype(str) + "</b><br>" + df['address'].fillna('').astype(str)
+                  + "<br>" + df['email'].fillna('').astype(str))
+        
+        for lat, lng, popup in zip(df['latitude'].to_numpy(), df['longitude'].to_numpy(), popups.to_numpy()):
             if show_markers:
                 folium.Marker(
-                    location=[row['latitude'], row['longitude']],
-                    popup=f"<b>{row['name']}</b><br>{row['address']}<br>{row['email']}",
+                    location=[lat, lng],
+                    popup=popup,
                     icon=folium.Icon(color='blue', icon='info-sign')
                 ).add_to(m)
             elif show_dots:
                 folium.CircleMarker(
-                    location=[row['latitude'], row['longitude']],
+                    location=[lat, lng],
                     radius=marker_size,
-                    popup=f"<b>{row['name']}</b><br>{row['address']}<br>{row['email']}",
+                    popup=popup,
                     color='blue',
                     fill=True,
                     fill_color='blue',
@@ -67,7 +72,7 @@ def create_map(df, center=None, heatmap=False, radius=10, show_markers=False, sh
     
     # Add heatmap if requested
     if heatmap:
-        heat_data = [[row['latitude'], row['longitude']] for idx, row in df.iterrows()]
+        heat_data = df[['latitude', 'longitude']].to_numpy(dtype=float).tolist()
         HeatMap(heat_data, radius=radius).add_to(m)
     
     # Add click handler for setting reference point
@@ -76,14 +81,12 @@ def create_map(df, center=None, heatmap=False, radius=10, show_markers=False, sh
     return m
 
 def calculate_distances(df, reference_point):
-    """Calculate distances from each volunteer to a reference point"""
-    distances = []
-    for idx, row in df.iterrows():
-        volunteer_point = (row['latitude'], row['longitude'])
-        distance = geodesic(reference_point, volunteer_point).kilometers
-        distances.append(distance)
-    
-    return distances
+    """Calculate great-circle (haversine) distances in km from each volunteer to a reference point"""
+    lat1 = np.radians(df['latitude'].to_numpy(dtype=float))
+    lng1 = np.radians(df['longitude'].to_numpy(dtype=float))
+    lat2, lng2 = np.radians(reference_point[0]), np.radians(reference_point[1])
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * 6371.0 * np.arcsin(np.sqrt(a))
 
 def main():
     st.title("Park Volunteer Analysis Tool")
@@ -101,8 +104,9 @@ def main():
         
         if uploaded_file is not None:
             # Save the uploaded file temporarily
+            uploaded_file.seek(0)
             with open("temp_upload.geojson", "wb") as f:
-                f.write(uploaded_file.getbuffer())
+                shutil.copyfileobj(uploaded_file, f, length=1024 * 1024)
             df = load_geojson("temp_upload.geojson")
         else:
             # Try to load the default file
@@ -208,6 +212,9 @@ def main():
             # Filter by max distance
             filtered_df = df[df['distance'] <= max_distance]
             
+            # Sorted once for the ring counts and the cumulative chart below
+            distances = np.sort(df['distance'].to_numpy(dtype=float))
+            
             # Create two columns for the top section
             col1, col2 = st.columns([3, 2])
             
@@ -238,17 +245,17 @@ def main():
                 
                 # Create distance rings
                 rings = [0, 1, 2, 5, 10, max_distance]
-                ring_counts = []
                 
-                for i in range(len(rings)-1):
-                    count = len(df[(df['distance'] >= rings[i]) & (df['distance'] < rings[i+1])])
-                    ring_counts.append({
-                        'Ring': f"{rings[i]}-{rings[i+1]} {unit_label}",
-                        'Count': count,
-                        'Percentage': f"{count / len(df) * 100:.1f}%"
-                    })
+                # Volunteers in each [start, end) range as a difference of binary searches;
+                # ranges past max_distance come out empty
+                edges = np.searchsorted(distances, rings, side='left')
+                counts = np.maximum(edges[1:] - edges[:-1], 0)
                 
-                ring_df = pd.DataFrame(ring_counts)
+                ring_df = pd.DataFrame({
+                    'Ring': [f"{start}-{end} {unit_label}" for start, end in zip(rings[:-1], rings[1:])],
+                    'Count': counts,
+                    'Percentage': [f"{count / len(df) * 100:.1f}%" for count in counts]
+                })
                 
                 # Display the ring data in a clean format
                 st.dataframe(
@@ -278,25 +285,14 @@ def main():
                 st.pyplot(fig)
             
             with chart_cols[1]:
-                # Cumulative distance chart
-                cumulative_data = []
-                total = 0
-                distances = sorted(df['distance'].tolist())
-                
-                for d in range(0, int(max_distance) + 1):
-                    count = len([x for x in distances if x <= d])
-                    cumulative_data.append({
-                        'Distance': d,
-                        'Volunteers': count,
-                        'Percentage': count / len(df) * 100
-                    })
-                
-                cumulative_df = pd.DataFrame(cumulative_data)
+                # Cumulative distance chart: binary-search the sorted distances at each step
+                distance_axis = np.arange(0, int(max_distance) + 1)
+                counts = np.searchsorted(distances, distance_axis, side='right')
                 
                 fig, ax = plt.subplots(figsize=(6, 4))
                 ax.plot(
-                    cumulative_df['Distance'], 
-                    cumulative_df['Percentage'],
+                    distance_axis, 
+                    counts / len(df) * 100,
                     marker='o',
                     markersize=4,
                     color='forestgreen'